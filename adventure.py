@@ -19,13 +19,23 @@ This file is Copyright (c) 2026 CSC111 Teaching Team
 """
 from __future__ import annotations
 
-import json
+import bisect
+import hashlib
+import os
 import random
+from array import array
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
 
 from game_entities import Location, Item
 from event_logger import Event, EventList
+from game_io import GameIO, TerminalIO
+from memory_accounting import deep_sizes
+from region_store import REGION_STORE_MAX_RESIDENT, RegionStore, is_region_store
+from undo_history import UndoNode, UndoTree
+from world_cache import WORLD_CACHE
+from world_reload import WorldDiff
+from world_validator import WorldValidationError
 
 # Note: You may add in other import statements here as needed
 
@@ -48,6 +58,29 @@ ARENA_START_ENERGY = 3
 ARENA_WIN_POINTS = 1
 ARENA_TARGET_POINTS = 5
 
+# Default undo budget of a game: most actions kept in the undo tree, and most (approximate) bytes of changes kept
+UNDO_MAX_ENTRIES = 1000
+UNDO_MAX_BYTES = 4 * 1024 * 1024
+
+# Game attributes changed by the simple "set" undo ops (see AdventureGame._apply_op)
+_SET_OP_ATTRIBUTES: dict[str, str] = {
+    "loc": "current_location_id",
+    "score": "score",
+    "moves": "moves_used",
+    "ongoing": "ongoing",
+    "arena": "bahen_arena_won",
+}
+
+# Which CSSU AI play_evolution_arena uses
+ARENA_AI_STRATEGIES: tuple[str, ...] = ("classic", "adaptive", "trained")
+
+# Asked after the player loses the Bahen arena
+ARENA_RETRY_PROMPT = 'Type "Try Again" to challenge it again, type "Quit" to quit, or anything else to stop: '
+
+# The trained CSSU AI policy (written by arena_training.py), and the most energy it tells apart
+ARENA_POLICY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "arena_policy.bin")
+ARENA_POLICY_MAX_ENERGY = 6
+
 
 # -------------------------
 # Undo + Arena gating state
@@ -65,6 +98,86 @@ class GameSnapshot:
     bahen_arena_won: bool
 
 
+@dataclass
+class BatchResult:
+    """The outcome of AdventureGame.process_batch.
+
+    Instance Attributes:
+        - results: the result of each command that was run, in order (the last one may be the failure)
+        - completed: whether every command ran and succeeded
+        - rolled_back: whether the batch's changes were undone because it did not complete (atomic batches)
+    """
+    results: list[str]
+    completed: bool
+    rolled_back: bool = False
+
+
+# Commands that can't be part of a batch, since they move through the history the batch is recorded in
+BATCH_EXCLUDED_COMMANDS: tuple[str, ...] = ("undo", "redo", "restart")
+
+
+# -------------------------
+# Zobrist state hashing
+# -------------------------
+# State feature -> its Zobrist key (filled in lazily; see zobrist_key)
+_ZOBRIST_KEYS: dict[tuple, int] = {}
+
+
+def zobrist_key(feature: tuple) -> int:
+    """Return the random-looking 64-bit key of one feature of a game state, e.g. ("score", 3),
+    ("visited", 7) or ("item", "laptop", 1) (a location id, or None for the inventory).
+
+    Keys are derived from the feature itself, so they are the same in every process and
+    hashes can be compared across sessions.
+    """
+    key = _ZOBRIST_KEYS.get(feature)
+    if key is None:
+        key = int.from_bytes(hashlib.blake2b(repr(feature).encode(), digest_size=8).digest(), 'little')
+        _ZOBRIST_KEYS[feature] = key
+    return key
+
+
+# -------------------------
+# Pre-rendered location output
+# -------------------------
+# Regular menu options available at each location
+MENU_OPTIONS: tuple[str, ...] = ("look", "inventory", "score", "log", "undo", "redo", "restart", "quit")
+MENU_HEADER = "What to do? Choose from: " + ", ".join(MENU_OPTIONS) + "\n"
+
+
+def is_menu_choice(choice: str) -> bool:
+    """Return whether the main loop accepts choice as a command (a menu option, or a go, take or drop);
+    any other line is rejected there without running anything."""
+    choice = choice.strip().lower()
+    return choice in MENU_OPTIONS or choice.startswith(("take ", "drop ", "go "))
+
+
+@dataclass(frozen=True)
+class LocationFrame:
+    """The output of one location, rendered once and reused every turn.
+
+    Instance Attributes:
+        - long: 'LOCATION <id>' header plus the long description
+        - brief: 'LOCATION <id>' header plus the brief description
+        - menu: the command menu shown at the location each turn
+    """
+    long: str
+    brief: str
+    menu: str
+
+
+def render_location_frame(loc: Location, commands: dict[str, int]) -> LocationFrame:
+    """Return the LocationFrame of loc, whose available commands are commands."""
+    menu = MENU_HEADER
+    if commands:
+        menu += "From here, you can also:\n" + "".join(f"- {action}\n" for action in commands)
+    return LocationFrame(
+        long=f"LOCATION {loc.id_num}\n{loc.long_description}",
+        brief=f"LOCATION {loc.id_num}\n{loc.brief_description}",
+        menu=menu
+    )
+
+
 # -------------------------
 # Evolution Arena classes
 # (User requested Move stays in this file)
@@ -90,6 +203,11 @@ class ArenaPlayer:
     last_move: Optional[Move] = None
 
 
+# Every possible move, and each move's position in ALL_MOVES
+ALL_MOVES: tuple[Move, ...] = tuple(Move(t, p) for t in TYPES for p in (1, 2, 3))
+MOVE_INDEX: dict[Move, int] = {m: i for i, m in enumerate(ALL_MOVES)}
+
+
 # -------------------------
 # Evolution Arena helpers
 # -------------------------
@@ -177,85 +295,306 @@ def arena_enforce_energy(player: ArenaPlayer, desired: Move) -> Tuple[Move, str]
     )
 
 
-def arena_ai_choose(ai: ArenaPlayer, opponent: ArenaPlayer) -> Move:
+def _arena_ai_distribution_exact(ai_energy: int, opp_low: bool, opp_last_move: Optional[Move]) -> dict[Move, float]:
+    """Return the exact move distribution of the simple AI (arena_ai_choose), worked out from its rules:
+    - If opponent is low energy (opp_low), play shadow 1 with probability 0.45 when ai_energy >= 2.
+    - Otherwise, pick uniformly among the types that counter the opponent's last move
+      (plus shadow if that move had power 1 and ai_energy >= 2), or among rock/paper/scissors.
+    - Pick power 3 w.p. 0.25 (if ai_energy >= 2), else power 2 w.p. 0.45 (if ai_energy >= 1), else power 1.
+    """
+    dist: dict[Move, float] = {}
+
+    ambush = 0.45 if opp_low and ai_energy >= 2 else 0.0
+    if ambush:
+        dist[Move("shadow", 1)] = ambush
+
+    types: list[str] = []
+    if opp_last_move is not None:
+        types = [t for t in TYPES if opp_last_move.type in DOMINANCE.get(t, set())]
+        if opp_last_move.power == 1 and ai_energy >= 2:
+            types.append("shadow")
+    if not types:
+        types = list(TYPES[:-1])
+
+    if ai_energy >= 2:
+        powers = {3: 0.25, 2: 0.75 * 0.45, 1: 0.75 * 0.55}
+    elif ai_energy >= 1:
+        powers = {2: 0.45, 1: 0.55}
+    else:
+        powers = {1: 1.0}
+
+    for t in types:
+        for power, p in powers.items():
+            move = Move(t, power)
+            dist[move] = dist.get(move, 0.0) + (1.0 - ambush) / len(types) * p
+    return dist
+
+
+def _arena_ai_state(ai_energy: int, opp_energy: int, opp_last_move: Optional[Move]) -> tuple[int, bool, int]:
+    """Return the key of _ARENA_AI_TABLE for a state: the simple AI only looks at whether its energy
+    is 0, 1 or at least 2, whether the opponent's energy is at most 1, and the opponent's last move."""
+    return (min(ai_energy, 2), opp_energy <= 1, -1 if opp_last_move is None else MOVE_INDEX[opp_last_move])
+
+
+def _arena_ai_table() -> dict[tuple[int, bool, int], tuple[tuple[Move, ...], tuple[float, ...]]]:
+    """Return the simple AI's move distribution for every distinct state, as (moves, cumulative probabilities)."""
+    table = {}
+    for ai_energy in (0, 1, 2):
+        for opp_low in (False, True):
+            for last in (None,) + ALL_MOVES:
+                dist = _arena_ai_distribution_exact(ai_energy, opp_low, last)
+                moves = tuple(m for m in ALL_MOVES if dist.get(m, 0.0) > 0.0)
+                cumulative = []
+                total = 0.0
+                for m in moves:
+                    total += dist[m]
+                    cumulative.append(total)
+                cumulative[-1] = 1.0  # so a single random.random() draw always lands on a move
+                table[(ai_energy, opp_low, -1 if last is None else MOVE_INDEX[last])] = (moves, tuple(cumulative))
+    return table
+
+
+# The simple AI's move distribution in each of its 78 distinct states
+_ARENA_AI_TABLE = _arena_ai_table()
+
+
+def arena_ai_distribution(ai_energy: int, opp_energy: int, opp_last_move: Optional[Move]) -> dict[Move, float]:
+    """Return the exact probability that the simple AI (arena_ai_choose) plays each move, when it has
+    ai_energy energy and its opponent has opp_energy energy and last played opp_last_move.
+    Moves it never plays in this state are left out.
+
+    >>> dist = arena_ai_distribution(3, 3, Move("rock", 2))
+    >>> sorted((m.type, m.power) for m in dist)
+    [('paper', 1), ('paper', 2), ('paper', 3)]
+    >>> round(dist[Move("paper", 3)], 4)
+    0.25
+    """
+    moves, cumulative = _ARENA_AI_TABLE[_arena_ai_state(ai_energy, opp_energy, opp_last_move)]
+    return {m: cumulative[i] - (cumulative[i - 1] if i > 0 else 0.0) for i, m in enumerate(moves)}
+
+
+def arena_ai_choose(ai: ArenaPlayer, opponent: ArenaPlayer, rng: Optional[random.Random] = None) -> Move:
     """
     Simple AI:
     - If opponent is low energy, sometimes play shadow 1 to punish power-1.
     - Otherwise, counter opponent's last move type if possible.
     - Pick power based on energy.
+
+    The move is sampled with a single random draw from the precomputed distribution
+    (see arena_ai_distribution), taken from rng (the global random generator by default).
     """
-    opp_low = opponent.energy <= 1
-
-    # Shadow ambush
-    if opp_low and ai.energy >= 2 and random.random() < 0.45:
-        return Move("shadow", 1)
-
-    # Counter last move if known
-    if opponent.last_move is not None:
-        target_type = opponent.last_move.type
-        counters = [t for t in TYPES if target_type in DOMINANCE.get(t, set())]
-        if opponent.last_move.power == 1 and ai.energy >= 2:
-            counters.append("shadow")
-        chosen_type = random.choice(counters) if counters else random.choice(TYPES[:-1])
-    else:
-        chosen_type = random.choice(TYPES[:-1])
+    moves, cumulative = _ARENA_AI_TABLE[_arena_ai_state(ai.energy, opponent.energy, opponent.last_move)]
+    draw = random.random() if rng is None else rng.random()
+    return moves[bisect.bisect_right(cumulative, draw)]
 
-    # Choose power
-    if ai.energy >= 2 and random.random() < 0.25:
-        power = 3
-    elif ai.energy >= 1 and random.random() < 0.45:
-        power = 2
-    else:
-        power = 1
 
-    return Move(chosen_type, power)
+# -------------------------
+# Adaptive (opponent-modelling) AI
+# -------------------------
+def _arena_outcome_table() -> tuple[tuple[int, ...], ...]:
+    """Return, for each pair of moves in ALL_MOVES, the outcome of a round between them under
+    arena_resolve_round: 1 if the first wins, -1 if the second wins, 0 for a draw."""
+    me = ArenaPlayer(name="me")
+    them = ArenaPlayer(name="them")
+    table = []
+    for mine in ALL_MOVES:
+        row = []
+        for theirs in ALL_MOVES:
+            gained_me, gained_them, _ = arena_resolve_round(me, mine, them, theirs)
+            row.append((gained_me > 0) - (gained_them > 0))
+        table.append(tuple(row))
+    return tuple(table)
 
 
-def arena_print_rules() -> None:
-    print("\n=== Evolution Arena Rules ===")
-    print("Types: rock, paper, scissors, shadow")
-    print("Dominance: rock>scissors, scissors>paper, paper>rock")
-    print("Shadow: beats ANY move with power 1")
-    print("Power: 1..3")
-    print("Energy start:", ARENA_START_ENERGY)
-    print("Costs: p1=0, p2=1, p3=2, shadow adds +2")
-    print("Regen: winner +1, loser +2, draw both +1")
-    print("Scoring: win +1, first to 5 wins")
-    print("Input examples: 'rock 2', 'scissors3', 'shadow 1', 'paper'")
-    print("Type 'rules' anytime to reprint rules.")
-    print("Type 'quit' anytime to quit the arena.\n")
+# ARENA_OUTCOMES[MOVE_INDEX[a]][MOVE_INDEX[b]] is 1 if a beats b, -1 if b beats a and 0 for a draw
+ARENA_OUTCOMES: tuple[tuple[int, ...], ...] = _arena_outcome_table()
 
+# How much each point of energy a move costs counts against its expected outcome, in the adaptive AI
+ARENA_ADAPTIVE_ENERGY_WEIGHT = 0.02
 
-def arena_prompt_move(player: ArenaPlayer) -> Optional[Move]:
-    """Prompt the human player for a move.
 
-    The player may also type 'rules' to reprint the rules, or type 'quit' to exit the arena immediately.
+class ArenaOpponentModel:
+    """Running counts of one opponent's moves, used to predict their next move.
 
-    Return:
-        - a Move if the player enters a valid move
-        - None if the player types 'quit'
-    """
-    while True:
-        raw = input(
-            f"{player.name} (energy={player.energy}, points={player.points}) choose move: "
-        ).strip()
+    Keeps a frequency count of each of the 12 moves, a count of which move followed each of the
+    opponent's own moves, and a count of which move answered each of our moves (an opponent that
+    counters our last move shows up there). Each observation updates three counters, and a
+    prediction combines one row of each table, so observe and distribution are both O(1).
 
-        if raw.lower() == "quit":
+    Instance Attributes:
+        - counts: counts[i] is how often ALL_MOVES[i] was played
+        - pair_counts: pair_counts[i][j] is how often ALL_MOVES[j] was played right after ALL_MOVES[i]
+        - reply_counts: reply_counts[i][j] is how often ALL_MOVES[j] was played in the round after we
+          played ALL_MOVES[i]; the last row counts the moves played before we had played anything
+
+    Representation Invariants:
+        - len(self.counts) == len(ALL_MOVES)
+        - len(self.pair_counts) == len(ALL_MOVES)
+        - len(self.reply_counts) == len(ALL_MOVES) + 1
+    """
+    counts: list[int]
+    pair_counts: list[list[int]]
+    reply_counts: list[list[int]]
+
+    # Private Instance Attributes:
+    #   - _prev: index of the last observed move, or None before the first observation
+
+    def __init__(self) -> None:
+        """Initialize a model that has not observed any moves."""
+        n = len(ALL_MOVES)
+        self.counts = [0] * n
+        self.pair_counts = [[0] * n for _ in range(n)]
+        self.reply_counts = [[0] * n for _ in range(n + 1)]
+        self._prev: Optional[int] = None
+
+    def observe(self, move: Move, reply_to: Optional[Move] = None) -> None:
+        """Record that the opponent played move, in a round after we played reply_to (None in the first round)."""
+        i = MOVE_INDEX[move]
+        self.counts[i] += 1
+        if self._prev is not None:
+            self.pair_counts[self._prev][i] += 1
+        self.reply_counts[self._reply_row(reply_to)][i] += 1
+        self._prev = i
+
+    def distribution(self, our_last_move: Optional[Move] = None, opp_energy: Optional[int] = None) -> list[float]:
+        """Return the probability of each move in ALL_MOVES being the opponent's next move, when we last
+        played our_last_move. The overall counts are combined with the counts after the opponent's
+        last move and after our_last_move (each weighted double), plus one move's worth of prior
+        spread evenly. If opp_energy is given, the moves the opponent can't afford are counted as
+        the rock 1 they would be forced to play.
+        """
+        n = len(ALL_MOVES)
+        after_theirs = self.pair_counts[self._prev] if self._prev is not None else [0] * n
+        after_ours = self.reply_counts[self._reply_row(our_last_move)]
+        weights = [0.0] * n
+        forced = MOVE_INDEX[Move("rock", 1)]
+        for i, move in enumerate(ALL_MOVES):
+            w = 1.0 / n + self.counts[i] + 2 * (after_theirs[i] + after_ours[i])
+            if opp_energy is not None and arena_energy_cost(move) > opp_energy:
+                i = forced
+            weights[i] += w
+        total = sum(weights)
+        return [w / total for w in weights]
+
+    def predict(self, our_last_move: Optional[Move] = None) -> Optional[Move]:
+        """Return the opponent's most likely next move, or None if nothing has been observed."""
+        if self._prev is None:
             return None
+        dist = self.distribution(our_last_move)
+        return ALL_MOVES[max(range(len(dist)), key=dist.__getitem__)]
 
-        if raw.lower() in {"help", "rules", "?"}:
-            arena_print_rules()
-            continue
+    @staticmethod
+    def _reply_row(our_move: Optional[Move]) -> int:
+        """Return the row of reply_counts for rounds after we played our_move."""
+        return len(ALL_MOVES) if our_move is None else MOVE_INDEX[our_move]
 
-        m = arena_parse_move(raw)
-        if m is None:
-            print("Invalid move. Try 'rock 2' or 'scissors3'. Type 'rules' to see rules.")
+
+def arena_ai_choose_adaptive(ai: ArenaPlayer, opponent: ArenaPlayer, model: ArenaOpponentModel,
+                             rng: Optional[random.Random] = None) -> Move:
+    """
+    Opponent-modelling AI:
+    - With no history, fall back to arena_ai_choose (drawing from rng).
+    - Otherwise, get the opponent's predicted move distribution from model (given our last move
+      and the opponent's energy).
+    - Play the affordable move with the best expected outcome against that distribution (a win
+      counts 1, a loss -1; power decides the rounds that type does not), minus
+      ARENA_ADAPTIVE_ENERGY_WEIGHT per point of energy it costs.
+    """
+    if model.predict() is None:
+        return arena_ai_choose(ai, opponent, rng)
+
+    dist = model.distribution(ai.last_move, opponent.energy)
+    best = Move("rock", 1)
+    best_value = None
+    for move, outcomes in zip(ALL_MOVES, ARENA_OUTCOMES):
+        cost = arena_energy_cost(move)
+        if cost > ai.energy:
             continue
+        value = sum(p * outcome for p, outcome in zip(dist, outcomes)) - ARENA_ADAPTIVE_ENERGY_WEIGHT * cost
+        if best_value is None or value > best_value:
+            best = move
+            best_value = value
+    return best
 
-        actual, note = arena_enforce_energy(player, m)
-        if note:
-            print(note)
-        return actual
+
+# -------------------------
+# Trained (lookup-table) AI
+# -------------------------
+# The number of states the trained policy distinguishes: points still needed by each side (1..ARENA_TARGET_POINTS),
+# energy of each side (0..ARENA_POLICY_MAX_ENERGY) and the opponent's last move (or none)
+ARENA_POLICY_STATES = (ARENA_TARGET_POINTS ** 2) * ((ARENA_POLICY_MAX_ENERGY + 1) ** 2) * (len(ALL_MOVES) + 1)
+
+# The loaded policy: None before the first lookup, an empty array if there is no usable policy file
+_ARENA_POLICY: Optional[array] = None
+
+
+def arena_policy_state(ai_need: int, opp_need: int, ai_energy: int, opp_energy: int,
+                       opp_last_move: Optional[Move]) -> int:
+    """Return the index of a state in the trained policy table, given the points each side still needs
+    to win, their energies and the opponent's last move. Needs above ARENA_TARGET_POINTS and energies
+    above ARENA_POLICY_MAX_ENERGY are treated as those maximums.
+    """
+    e = ARENA_POLICY_MAX_ENERGY + 1
+    index = min(ai_need, ARENA_TARGET_POINTS) - 1
+    index = index * ARENA_TARGET_POINTS + min(opp_need, ARENA_TARGET_POINTS) - 1
+    index = index * e + min(ai_energy, ARENA_POLICY_MAX_ENERGY)
+    index = index * e + min(opp_energy, ARENA_POLICY_MAX_ENERGY)
+    return index * (len(ALL_MOVES) + 1) + (0 if opp_last_move is None else MOVE_INDEX[opp_last_move] + 1)
+
+
+def arena_load_policy(filename: str = ARENA_POLICY_FILE) -> array:
+    """Return the policy table in filename: one byte per state, the index in ALL_MOVES of the move to play.
+    Return an empty array if the file is missing or is not a policy table."""
+    policy = array('B')
+    try:
+        with open(filename, 'rb') as f:
+            policy.frombytes(f.read())
+    except OSError:
+        return array('B')
+    if len(policy) != ARENA_POLICY_STATES or max(policy) >= len(ALL_MOVES):
+        return array('B')
+    return policy
+
+
+def arena_ai_choose_trained(ai: ArenaPlayer, opponent: ArenaPlayer,
+                            target_points: int = ARENA_TARGET_POINTS, rng: Optional[random.Random] = None) -> Move:
+    """
+    Trained AI: play the move the trained policy (arena_training.py) gives for the current state,
+    which is a single table lookup. The policy is loaded from ARENA_POLICY_FILE the first time it is
+    needed; without a usable policy file, fall back to arena_ai_choose (drawing from rng).
+    """
+    global _ARENA_POLICY
+    if _ARENA_POLICY is None:
+        _ARENA_POLICY = arena_load_policy()
+    if not _ARENA_POLICY:
+        return arena_ai_choose(ai, opponent, rng)
+    state = arena_policy_state(target_points - ai.points, target_points - opponent.points,
+                               ai.energy, opponent.energy, opponent.last_move)
+    return ALL_MOVES[_ARENA_POLICY[state]]
+
+
+ARENA_RULES_TEXT = (
+    "\n=== Evolution Arena Rules ===\n"
+    "Types: rock, paper, scissors, shadow\n"
+    "Dominance: rock>scissors, scissors>paper, paper>rock\n"
+    "Shadow: beats ANY move with power 1\n"
+    "Power: 1..3\n"
+    f"Energy start: {ARENA_START_ENERGY}\n"
+    "Costs: p1=0, p2=1, p3=2, shadow adds +2\n"
+    "Regen: winner +1, loser +2, draw both +1\n"
+    "Scoring: win +1, first to 5 wins\n"
+    "Input examples: 'rock 2', 'scissors3', 'shadow 1', 'paper'\n"
+    "Type 'rules' anytime to reprint rules.\n"
+    "Type 'quit' anytime to quit the arena.\n\n"
+)
+
+
+def arena_print_rules(io: Optional[GameIO] = None) -> None:
+    """Print the arena rules (buffered in io if given)."""
+    if io is None:
+        print(ARENA_RULES_TEXT, end="")
+    else:
+        io.write(ARENA_RULES_TEXT)
 
 
 def arena_apply_regen(p1: ArenaPlayer, p2: ArenaPlayer, gained1: int, gained2: int) -> None:
@@ -274,75 +613,179 @@ def arena_apply_regen(p1: ArenaPlayer, p2: ArenaPlayer, gained1: int, gained2: i
         p2.energy += 1
 
 
-def play_evolution_arena(
-    target_points: int = ARENA_TARGET_POINTS, seed: Optional[int] = None
-) -> Optional[bool]:
-    """Run the Evolution Arena mini-game.
+def arena_play_round(p1: ArenaPlayer, m1: Move, p2: ArenaPlayer, m2: Move) -> Tuple[int, int, str]:
+    """Play one round in which p1 plays m1 and p2 plays m2 (both affordable): pay energy, score the round
+    and regenerate energy. Return (p1_points_gained, p2_points_gained, outcome_text)."""
+    p1.energy -= arena_energy_cost(m1)
+    p2.energy -= arena_energy_cost(m2)
+    p1.last_move = m1
+    p2.last_move = m2
 
-    The human can type 'quit' at any move prompt to exit the arena early.
+    gained1, gained2, outcome = arena_resolve_round(p1, m1, p2, m2)
+    p1.points += gained1
+    p2.points += gained2
 
-    Return:
-        - True if the human wins the arena
-        - False if the human loses the arena
-        - None if the human quits early
-    """
-    if seed is not None:
-        random.seed(seed)
+    arena_apply_regen(p1, p2, gained1, gained2)
 
-    human = ArenaPlayer(name="You", energy=ARENA_START_ENERGY)
-    ai = ArenaPlayer(name="CSSU AI", energy=ARENA_START_ENERGY)
+    # Clamp non-negative
+    p1.energy = max(0, p1.energy)
+    p2.energy = max(0, p2.energy)
+    return gained1, gained2, outcome
 
-    arena_print_rules()
 
-    round_num = 1
-    while human.points < target_points and ai.points < target_points:
-        print(f"--- Arena Round {round_num} ---")
+class ArenaMatch:
+    """One Evolution Arena match, advanced one line of the human's input at a time (see feed).
 
-        m_h = arena_prompt_move(human)
-        if m_h is None:
-            print("You quit the arena.\n")
-            return None
+    A match never reads input itself, so any number of matches can be in progress at once (e.g. one
+    per session on a server) without a thread or a blocking read each. Its output is written to io.
 
-        desired_ai = arena_ai_choose(ai, human)
-        m_a, note_a = arena_enforce_energy(ai, desired_ai)
-        if note_a:
-            print(note_a)
+    Instance Attributes:
+        - target_points: the points needed to win
+        - ai_strategy: the CSSU AI (see ARENA_AI_STRATEGIES)
+        - human, ai: the two players
+        - round_num: the number of the current round
+        - finished: whether the match is over (won, lost or quit)
+        - result: True if the human won, False if they lost, None if they quit (or it isn't over)
 
-        # Pay energy
-        cost_h = arena_energy_cost(m_h)
-        cost_a = arena_energy_cost(m_a)
-        human.energy -= cost_h
-        ai.energy -= cost_a
+    Representation Invariants:
+        - self.ai_strategy in ARENA_AI_STRATEGIES
+        - self.result is None or self.finished
+    """
+    target_points: int
+    ai_strategy: str
+    human: ArenaPlayer
+    ai: ArenaPlayer
+    round_num: int
+    finished: bool
+    result: Optional[bool]
+
+    # Private Instance Attributes:
+    #   - _rng: the match's own random generator (None: the global one)
+    #   - _model: the opponent model of the adaptive AI, or None
+    #   - _io: where the match writes its output
+
+    def __init__(self, target_points: int = ARENA_TARGET_POINTS, seed: Optional[int] = None,
+                 ai_strategy: str = "classic", io: Optional[GameIO] = None) -> None:
+        """Start a match, writing the rules and the first round's header to io (the terminal by default).
+        The CSSU AI draws from a generator seeded with seed, or from the global one if seed is None.
+        """
+        if ai_strategy not in ARENA_AI_STRATEGIES:
+            raise ValueError(f"Unknown arena AI strategy: {ai_strategy}")
+        self.target_points = target_points
+        self.ai_strategy = ai_strategy
+        self.human = ArenaPlayer(name="You", energy=ARENA_START_ENERGY)
+        self.ai = ArenaPlayer(name="CSSU AI", energy=ARENA_START_ENERGY)
+        self.round_num = 1
+        self.finished = False
+        self.result = None
+        self._rng = random.Random(seed) if seed is not None else None
+        self._model = ArenaOpponentModel() if ai_strategy == "adaptive" else None
+        self._io = io if io is not None else TerminalIO()
+
+        arena_print_rules(self._io)
+        self._begin_round()
+
+    def prompt(self) -> str:
+        """Return the prompt for the human's next move."""
+        return f"{self.human.name} (energy={self.human.energy}, points={self.human.points}) choose move: "
+
+    def feed(self, line: str) -> None:
+        """Handle one line typed by the human: a move (which plays a round), 'rules' to reprint the rules,
+        or 'quit' to leave the match.
+
+        Preconditions:
+            - not self.finished
+        """
+        raw = line.strip()
+        if raw.lower() == "quit":
+            self._io.write("You quit the arena.\n\n")
+            self.finished = True
+            return
 
-        human.last_move = m_h
-        ai.last_move = m_a
+        if raw.lower() in {"help", "rules", "?"}:
+            arena_print_rules(self._io)
+            return
 
-        print(f"You play:    {m_h.type} {m_h.power} (cost {cost_h})")
-        print(f"CSSU AI plays:{m_a.type} {m_a.power} (cost {cost_a})")
+        m = arena_parse_move(raw)
+        if m is None:
+            self._io.write("Invalid move. Try 'rock 2' or 'scissors3'. Type 'rules' to see rules.\n")
+            return
+
+        m_h, note = arena_enforce_energy(self.human, m)
+        if note:
+            self._io.write(note + "\n")
+        self._play_round(m_h)
+
+    def _play_round(self, m_h: Move) -> None:
+        """Play a round in which the human plays m_h (affordable), then begin the next round or end the match."""
+        human, ai, io = self.human, self.ai, self._io
+        if self._model is not None:
+            desired_ai = arena_ai_choose_adaptive(ai, human, self._model, self._rng)
+        elif self.ai_strategy == "trained":
+            desired_ai = arena_ai_choose_trained(ai, human, self.target_points, self._rng)
+        else:
+            desired_ai = arena_ai_choose(ai, human, self._rng)
+        m_a, note_a = arena_enforce_energy(ai, desired_ai)
+        if note_a:
+            io.write(note_a + "\n")
 
-        gained_h, gained_a, outcome = arena_resolve_round(human, m_h, ai, m_a)
-        print(outcome)
+        if self._model is not None:
+            self._model.observe(m_h, ai.last_move)
 
-        human.points += gained_h
-        ai.points += gained_a
+        io.write(
+            f"You play:    {m_h.type} {m_h.power} (cost {arena_energy_cost(m_h)})\n"
+            f"CSSU AI plays:{m_a.type} {m_a.power} (cost {arena_energy_cost(m_a)})\n"
+        )
 
-        arena_apply_regen(human, ai, gained_h, gained_a)
+        _, _, outcome = arena_play_round(human, m_h, ai, m_a)
+        io.write(outcome + "\n")
 
-        # Clamp non-negative
-        human.energy = max(0, human.energy)
-        ai.energy = max(0, ai.energy)
+        io.write(
+            f"Score: You {human.points} - {ai.points} CSSU AI\n"
+            f"Energy: You {human.energy} | CSSU AI {ai.energy}\n\n"
+        )
 
-        print(f"Score: You {human.points} - {ai.points} CSSU AI")
-        print(f"Energy: You {human.energy} | CSSU AI {ai.energy}\n")
+        self.round_num += 1
+        self._begin_round()
 
-        round_num += 1
+    def _begin_round(self) -> None:
+        """Write the header of the current round, or end the match if a player has reached target_points."""
+        if self.human.points < self.target_points and self.ai.points < self.target_points:
+            self._io.write(f"--- Arena Round {self.round_num} ---\n")
+            return
+        winner = "You" if self.human.points >= self.target_points else "CSSU AI"
+        self._io.write(f"=== ARENA OVER: {winner} wins! ===\n\n")
+        self.finished = True
+        self.result = self.human.points >= self.target_points
 
-    winner = "You" if human.points >= target_points else "CSSU AI"
-    print(f"=== ARENA OVER: {winner} wins! ===\n")
-    return human.points >= target_points
 
+def play_evolution_arena(
+    target_points: int = ARENA_TARGET_POINTS, seed: Optional[int] = None,
+    ai_strategy: str = "classic", io: Optional[GameIO] = None
+) -> Optional[bool]:
+    """Run a whole Evolution Arena match (see ArenaMatch) through io (the terminal by default), reading
+    each move from io. Each round's output is buffered in io and written in one go before the next prompt.
 
+    The human can type 'quit' at any move prompt to exit the arena early; running out of input
+    (EOFError) is treated the same as 'quit'.
+    ai_strategy picks the CSSU AI: "classic" (arena_ai_choose), "adaptive" (arena_ai_choose_adaptive)
+    or "trained" (arena_ai_choose_trained).
 
+    Return:
+        - True if the human wins the arena
+        - False if the human loses the arena
+        - None if the human quits early
+    """
+    if io is None:
+        io = TerminalIO()
+    match = ArenaMatch(target_points, seed, ai_strategy, io)
+    while not match.finished:
+        try:
+            line = io.read(match.prompt())
+        except EOFError:
+            line = "quit"
+        match.feed(line)
+    return match.result
 
 
 class AdventureGame:
@@ -356,7 +799,7 @@ class AdventureGame:
 
     """
 
-    _locations: dict[int, Location]
+    _locations: dict[int, Location] | RegionStore
     _items: list[Item]
     current_location_id: int
     ongoing: bool
@@ -367,12 +810,40 @@ class AdventureGame:
     moves_used: int
     max_moves: int
 
-    def __init__(self, game_data_file: str, initial_location_id: int, max_moves: int = 30) -> None:
+    def __init__(self, game_data_file: str, initial_location_id: int, max_moves: int = 30,
+                 io: Optional[GameIO] = None, validate: bool = True,
+                 undo_max_entries: Optional[int] = UNDO_MAX_ENTRIES,
+                 undo_max_bytes: Optional[int] = UNDO_MAX_BYTES,
+                 max_resident_regions: int = REGION_STORE_MAX_RESIDENT) -> None:
         """
         Initialize a new text adventure game, based on the data in the given file, setting starting location of game
-        at the given initial location ID.
+        at the given initial location ID. The game reads and writes through io (the terminal by default).
+        The undo tree keeps at most undo_max_entries actions (and about undo_max_bytes bytes of changes).
+
+        game_data_file may also be a region store directory (see region_store): the locations are then
+        paged in from disk as needed, keeping at most max_resident_regions regions in memory.
+
+        Unless validate is False, raise WorldValidationError if the data file is not a valid world
+        for a game starting at initial_location_id.
         """
-        self._locations, self._items = self._load_game_data(game_data_file)
+        # The region store the locations are paged in from, or None if the whole world is loaded
+        self._regions: Optional[RegionStore] = None
+        if is_region_store(game_data_file):
+            self._regions = RegionStore(game_data_file, max_resident_regions, on_evict=self._forget_frames)
+            if validate and initial_location_id not in self._regions:
+                raise WorldValidationError(game_data_file, [
+                    f"the starting location {initial_location_id!r} does not exist"])
+            self._locations = self._regions
+            self._items = [Item(record['name'], record['description'], record['start_position'],
+                                record['target_position'], record['target_points'])
+                           for record in self._regions.item_records()]
+            self._graph = self._regions.graph.overlay()
+        else:
+            self._locations, self._items = self._load_game_data(
+                game_data_file, initial_location_id if validate else None
+            )
+            # Which command leads where, shared with other games of this world (go() moves through it)
+            self._graph = WORLD_CACHE.graph(game_data_file).overlay()
 
         self.current_location_id = initial_location_id  # game begins at this location
         self.ongoing = True  # whether the game is ongoing
@@ -383,8 +854,11 @@ class AdventureGame:
         self.moves_used = 0
         self.max_moves = max_moves
 
-        # Undo stack
-        self._undo_stack: list[GameSnapshot] = []
+        # Undo tree: each action stores only the changes it made (bounded: the oldest history is evicted)
+        self._undo_stack = UndoTree(undo_max_entries, undo_max_bytes)
+
+        # Whether a process_batch is running (its commands then share one undo node)
+        self._in_batch = False
 
         # Restart support: remember the original starting location id
         self._start_location_id = initial_location_id
@@ -392,21 +866,63 @@ class AdventureGame:
         # Bahen gate: must beat CSSU AI once before taking laptop at Bahen
         self.bahen_arena_won = False
 
+        # Which CSSU AI the Bahen arena uses (see ARENA_AI_STRATEGIES)
+        self.arena_ai_strategy = "classic"
+
+        # The Bahen arena in progress (process_choice feeds it every line until it ends), whether the
+        # player is being asked to retry a lost match, and the item the arena guards
+        self._arena: Optional[ArenaMatch] = None
+        self._arena_retrying = False
+        self._arena_item = ""
+
+        # Where the game reads commands and writes output (the main loop and the arena both use it)
+        self.io = io if io is not None else TerminalIO()
+
+        # Pre-rendered output of each location, built the first time a location is shown
+        self._frames: dict[int, LocationFrame] = {}
+
+        # Arena RNG seeds: one per arena match played, so a session can be replayed exactly
+        self.arena_seeds: list[int] = []
+        self._queued_arena_seeds: list[int] = []
+
         # Add initial event to event log (so Log is not empty at the start)
         start_loc = self.get_current_location()
         self.event_log.add_event(Event(start_loc.id_num, start_loc.long_description), "")
 
-        # Save initial snapshot for restart
+        # The player starts out seeing the start location, so it is visited from the start (whether or
+        # not anything describes it), like every location the player has moved to
+        start_loc.visited = True
+
+        # Zobrist hash of the current state, kept up to date by _apply_op (see state_hash)
+        self._state_hash = self.state_hash(recompute=True)
+
+        # Where each item is (a location id, or None for the inventory), kept up to date by _apply_op
+        self._item_places = self._index_items()
+
+        # Save initial snapshot for restart (and where it puts each item)
         self._initial_snapshot: GameSnapshot = self._make_snapshot()
+        self._initial_item_places = dict(self._item_places)
 
     @staticmethod
-    def _load_game_data(filename: str) -> tuple[dict[int, Location], list[Item]]:
+    def _load_game_data(filename: str, start_id: Optional[int] = None) -> tuple[dict[int, Location], list[Item]]:
         """Load locations and items from a JSON file with the given filename and
         return a tuple consisting of (1) a dictionary of locations mapping each game location's ID to a Location object,
         and (2) a list of all Item objects.
+
+        If start_id is given, first validate the world for a game starting there (see world_validator)
+        and raise WorldValidationError if it has problems.
+
+        The parsed file (and its validation) comes from the process-wide WORLD_CACHE, so loading a
+        world that is already cached only builds this game's own Location and Item objects. The
+        command dict of each location is the cached one, shared with every other game of the world
+        (the game itself reads the commands from the world's graph).
         """
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = WORLD_CACHE.load(filename)
+
+        if start_id is not None:
+            problems = WORLD_CACHE.validate(filename, start_id)
+            if problems:
+                raise WorldValidationError(filename, problems)
 
         locations = {}
         for loc_data in data['locations']:
@@ -415,7 +931,7 @@ class AdventureGame:
                 loc_data['brief_description'],
                 loc_data['long_description'],
                 loc_data['available_commands'],
-                loc_data['items']
+                list(loc_data['items'])
             )
             locations[loc_data['id']] = location_obj
 
@@ -445,6 +961,33 @@ class AdventureGame:
         """Return the player's current Location."""
         return self._locations[self.current_location_id]
 
+    def get_frame(self, loc_id: Optional[int] = None) -> LocationFrame:
+        """Return the pre-rendered LocationFrame of the given location (the current location by default)."""
+        loc = self.get_location(loc_id)
+        frame = self._frames.get(loc.id_num)
+        if frame is None:
+            frame = render_location_frame(loc, self._graph.commands_of(loc.id_num))
+            self._frames[loc.id_num] = frame
+        return frame
+
+    def available_commands(self, loc_id: Optional[int] = None) -> dict[str, int]:
+        """Return the commands available at the given location (the current location by default),
+        mapped to the ids of the locations they lead to."""
+        return self._graph.commands_of(self.current_location_id if loc_id is None else loc_id)
+
+    def get_start_location_id(self) -> int:
+        """Return the id of the location the game starts (and restarts) at."""
+        return self._start_location_id
+
+    def get_all_locations(self) -> list[Location]:
+        """Return every Location in the game. With a region store this pages in the whole world, and
+        the Locations are only good for reading."""
+        return list(self._locations.values())
+
+    def get_all_items(self) -> list[Item]:
+        """Return every Item in the game."""
+        return list(self._items)
+
     def get_item_by_names(self, name: str) -> Optional[Item]:
         """Return the Item whose name matches. Otherwise, return None."""
         name = name.strip().lower()
@@ -461,9 +1004,9 @@ class AdventureGame:
         """Increase moves_used by 1. End the game if max_moves reached.
         Return a lose message if the player loses, otherwise return None.
         """
-        self.moves_used += 1
+        self._set("moves", self.moves_used + 1)
         if self.moves_used >= self.max_moves:
-            self.ongoing = False
+            self._set("ongoing", False)
             return f"You ran out of moves. YOU LOSE :(( (moves: {self.moves_used}/{self.max_moves})"
         return None
 
@@ -476,11 +1019,17 @@ class AdventureGame:
         return None
 
     def process_choice(self, choice: str) -> str:
-        """Process a command that does not require direct menu validation."""
+        """Process a command that does not require direct menu validation.
+
+        While the Bahen arena is in progress (see arena_prompt), every line is arena input instead.
+        """
+        if self._arena is not None:
+            return self._arena_input(choice)
+
         choice = choice.strip().lower()
 
         if choice == "quit":
-            self.ongoing = False
+            self._set("ongoing", False)
             return "Thanks for playing!"
 
         elif choice == "look":
@@ -502,6 +1051,9 @@ class AdventureGame:
         elif choice == "undo":
             return self.undo()
 
+        elif choice == "redo":
+            return self.redo()
+
         elif choice == "restart":
             return self.restart()
 
@@ -517,6 +1069,58 @@ class AdventureGame:
         else:
             return "Invalid command."
 
+    def process_batch(self, commands: list[str], atomic: bool = False) -> BatchResult:
+        """Run commands with process_choice as one action: a single undo undoes them all.
+
+        Stop after the first command that fails (an unknown command, or a go, take or drop that
+        does nothing) or that ends the game. If atomic, a batch that stops before running every
+        command successfully is rolled back entirely, as if it was never run: the output it
+        buffered in io is dropped and any arena seeds it took are queued again.
+
+        Raise ValueError (running nothing) if the batch contains undo, redo or restart, or if the
+        Bahen arena is in progress. A take that starts the arena stops the batch.
+        """
+        if self._arena is not None:
+            raise ValueError("a batch can't be run while the arena is in progress")
+        choices = [command.strip().lower() for command in commands]
+        excluded = [choice for choice in choices if choice in BATCH_EXCLUDED_COMMANDS]
+        if excluded:
+            raise ValueError(f"{excluded[0]!r} can't be part of a batch")
+
+        result = BatchResult([], True)
+        if not choices:
+            return result
+
+        output = self.io.buffered()
+        seeds_used = len(self.arena_seeds)
+        seeds_queued = len(self._queued_arena_seeds)
+        self._push_undo("batch: " + "; ".join(choices))
+        self._in_batch = True
+        try:
+            for i, choice in enumerate(choices):
+                moves = self.moves_used
+                outcome = self.process_choice(choice)
+                result.results.append(outcome)
+                failed = outcome == "Invalid command." or (
+                    choice.startswith(("go ", "take ", "drop ")) and self.moves_used == moves)
+                if failed or (not self.ongoing and i < len(choices) - 1):
+                    result.completed = False
+                    break
+        finally:
+            self._in_batch = False
+
+        if (atomic and not result.completed) or not self._undo_stack.cursor.ops:
+            self._revert_ops(self._undo_stack.abandon())
+            result.rolled_back = atomic and not result.completed
+            if result.rolled_back:  # including an arena challenge the batch started
+                self._end_arena()
+                self.io.discard(output)
+                taken = self.arena_seeds[seeds_used:]
+                del self.arena_seeds[seeds_used:]
+                # the seeds it took from the queue came first; the others were drawn fresh
+                self._queued_arena_seeds[:0] = taken[:seeds_queued - len(self._queued_arena_seeds)]
+        return result
+
     def take(self, item: str) -> str:
         """Take the item from the current location into inventory (case-insensitive).
         Adds 1 point as a reward.
@@ -536,54 +1140,95 @@ class AdventureGame:
         if match is None:
             return f"There is no '{item}' here to take."
 
-        # Bahen puzzle gate: must win arena before taking laptop at Bahen (id 1)
+        # Bahen puzzle gate: must win arena before taking laptop at Bahen (id 1).
+        # The arena is played through the next process_choice calls; winning it finishes this take.
         if loc.id_num == 1 and match.strip().lower() == "laptop" and not self.bahen_arena_won:
-            print("\nYour friend blocks the laptop.")
-            print("\"This is the CSSU AI model. Beat it first!\"\n")
-
-            while True:
-                arena_result = play_evolution_arena(target_points=ARENA_TARGET_POINTS)
-
-                if arena_result is None:
-                    return "You quit the arena challenge. The laptop remains locked."
-
-                if arena_result:
-                    self.bahen_arena_won = True
-                    print("You beat the CSSU AI! Your friend cheers and steps aside.\n")
-                    break
-                else:
-                    print("\nYou lost to the CSSU AI.")
-                    retry = input(
-                        'Type "Try Again" to challenge it again, type "Quit" to quit, or anything else to stop: '
-                    ).strip().lower()
-
-                    if retry == "try again":
-                        continue
-                    if retry == "quit":
-                        return "You quit the arena challenge. The laptop remains locked."
-                    return "You step back from the challenge. The laptop remains locked."
-
+            self.io.write("\nYour friend blocks the laptop.\n\"This is the CSSU AI model. Beat it first!\"\n\n")
+            self._arena_item = match
+            self._start_arena_match()
+            return ""
 
         item_obj = self._find_item(match)
         if item_obj is None:
             return f"That item '{match}' isn't in the items list."
 
         # IMPORTANT: push undo BEFORE changing state
-        self._push_undo()
+        self._push_undo(f"take {item_obj.name}")
 
-        loc.items.remove(match)
-        self.inventory.append(item_obj)
+        self._move_item(item_obj, loc.id_num, None)
 
         lose_msg = self.consume_moves()
         if lose_msg is not None:
             return lose_msg
 
-        self.score += 1
-        self.event_log.add_event(Event(loc.id_num, loc.brief_description), f"take {item_obj.name}")
+        self._set("score", self.score + 1)
+        self._log_event(loc, f"take {item_obj.name}")
 
         end_msg = self.win_lose_conditions()
         return end_msg if end_msg else f"You picked up {item_obj.name}."
 
+    def arena_prompt(self) -> Optional[str]:
+        """Return the prompt for the next line of the Bahen arena in progress, or None if there is none."""
+        if self._arena is None:
+            return None
+        return ARENA_RETRY_PROMPT if self._arena_retrying else self._arena.prompt()
+
+    def _start_arena_match(self) -> None:
+        """Start a new Bahen arena match."""
+        self._arena = ArenaMatch(ARENA_TARGET_POINTS, self._next_arena_seed(), self.arena_ai_strategy, self.io)
+        self._arena_retrying = False
+
+    def _end_arena(self) -> None:
+        """Leave the Bahen arena (if it is in progress)."""
+        self._arena = None
+        self._arena_retrying = False
+
+    def _arena_input(self, line: str) -> str:
+        """Handle one line of input to the Bahen arena: a line for the match in progress, or the answer
+        to ARENA_RETRY_PROMPT after a loss. Return the outcome of the take that started the arena once
+        the arena is over, or "" while it goes on (its output is written to io)."""
+        if self._arena_retrying:
+            retry = line.strip().lower()
+            if retry == "try again":
+                self._start_arena_match()
+                return ""
+            self._end_arena()
+            if retry == "quit":
+                return "You quit the arena challenge. The laptop remains locked."
+            return "You step back from the challenge. The laptop remains locked."
+
+        match = self._arena
+        match.feed(line)
+        if not match.finished:
+            return ""
+        if match.result is None:
+            self._end_arena()
+            return "You quit the arena challenge. The laptop remains locked."
+        if not match.result:
+            self.io.write("\nYou lost to the CSSU AI.\n")
+            self._arena_retrying = True
+            return ""
+
+        self._end_arena()
+        self._set("arena", True)
+        self.io.write("You beat the CSSU AI! Your friend cheers and steps aside.\n\n")
+        return self.take(self._arena_item)
+
+    def _next_arena_seed(self) -> int:
+        """Return the RNG seed for the next arena match and record it in arena_seeds.
+        Seeds queued by queue_arena_seeds are used first (replay); otherwise a fresh one is drawn.
+        """
+        if self._queued_arena_seeds:
+            seed = self._queued_arena_seeds.pop(0)
+        else:
+            seed = random.randrange(2 ** 32)
+        self.arena_seeds.append(seed)
+        return seed
+
+    def queue_arena_seeds(self, seeds: list[int]) -> None:
+        """Make the next arena matches use the given seeds, in order."""
+        self._queued_arena_seeds.extend(seeds)
+
     def drop(self, item_name: str) -> str:
         """Drop an item at the current location."""
         item_name = item_name.strip()
@@ -595,19 +1240,18 @@ class AdventureGame:
         for item in self.inventory:
             if item.name.lower() == item_name.lower():
                 # IMPORTANT: push undo BEFORE changing state
-                self._push_undo()
+                self._push_undo(f"drop {item.name}")
 
-                self.inventory.remove(item)
-                location.items.append(item.name)
+                self._move_item(item, None, location.id_num)
 
                 lose_msg = self.consume_moves()
                 if lose_msg is not None:
                     return lose_msg
 
                 if location.id_num == item.target_position:
-                    self.score += item.target_points
+                    self._set("score", self.score + item.target_points)
 
-                self.event_log.add_event(Event(location.id_num, location.brief_description), f"drop {item.name}")
+                self._log_event(location, f"drop {item.name}")
 
                 win_msg = self.win_lose_conditions()
                 if win_msg:
@@ -639,7 +1283,7 @@ class AdventureGame:
                 if item_name not in target_items:
                     return ""
 
-            self.ongoing = False
+            self._set("ongoing", False)
             return "You returned all the missing items. CONGRATULATIONS! YOU WIN :))"
 
         return ""
@@ -647,25 +1291,26 @@ class AdventureGame:
     def go(self, direction: str) -> str:
         """Move the player in the given direction if possible."""
         direction = direction.strip().lower()
-        location = self.get_current_location()
-        cmd = f"go {direction}"
-
-        next_id = location.available_commands.get(cmd)
+        next_id = self._graph.go_target(self.current_location_id, direction)
         if next_id is None:
             return "You can't go that way."
 
         # IMPORTANT: push undo BEFORE changing state
-        self._push_undo()
+        cmd = f"go {direction}"
+        self._push_undo(cmd)
 
-        self.current_location_id = next_id
+        self._set("loc", next_id)
 
         lose_msg = self.consume_moves()
         if lose_msg is not None:
             return lose_msg
 
         new_loc = self.get_current_location()
-        self.event_log.add_event(Event(new_loc.id_num, new_loc.brief_description), cmd)
-        return self.describe_current_location(force_long=False)
+        self._log_event(new_loc, cmd)
+        description = self.describe_current_location(force_long=False)
+        if self._regions is not None:  # page in where the player may go next
+            self._regions.prefetch(self._graph.commands_of(next_id).values())
+        return description
 
     def describe_current_location(self, force_long: bool = False) -> str:
         """Return the appropriate description of the current location.
@@ -674,12 +1319,74 @@ class AdventureGame:
         Always includes 'LOCATION <id>' header.
         """
         loc = self.get_current_location()
+        frame = self.get_frame(loc.id_num)
 
         if force_long or not loc.visited:
-            loc.visited = True
-            return f"LOCATION {loc.id_num}\n{loc.long_description}"
+            if not loc.visited:
+                self._change(("visited", loc.id_num, False, True))
+            return frame.long
+        else:
+            return frame.brief
+
+    # -------------------------
+    # State changes (recorded in the undo tree)
+    # -------------------------
+    def _change(self, op: tuple) -> None:
+        """Record op in the current undo node and apply it. See _apply_op for the kinds of op.
+        A "visited" op is never an undoable action by itself."""
+        self._undo_stack.record(op, action=op[0] != "visited")
+        self._apply_op(op, True)
+
+    def _set(self, kind: str, value: object) -> None:
+        """Change the attribute named by kind (a key of _SET_OP_ATTRIBUTES) to value."""
+        old = getattr(self, _SET_OP_ATTRIBUTES[kind])
+        if old != value:
+            self._change((kind, old, value))
+
+    def _move_item(self, item: Item, src: Optional[int], dst: Optional[int]) -> None:
+        """Move item from location src to location dst (None is the inventory)."""
+        index = self.inventory.index(item) if src is None else self._locations[src].items.index(item.name)
+        self._change(("item", item, src, index, dst))
+
+    def _log_event(self, loc: Location, command: str) -> None:
+        """Add an event at loc, reached with command, to the event log."""
+        self._change(("event", loc.id_num, loc.brief_description, command))
+
+    def _apply_op(self, op: tuple, forward: bool) -> None:
+        """Apply op (forward=True) or revert it (forward=False). The kinds of op are:
+        - (kind, old, new) for kind in _SET_OP_ATTRIBUTES: set that attribute
+        - ("visited", loc_id, old, new): set the visited flag of a location
+        - ("item", item, src, index, dst): move item from position index of src to the end of dst,
+          where src and dst are location ids, or None for the inventory
+        - ("event", loc_id, description, command): append an event to the event log
+        Ops are reverted in the reverse of the order they were applied.
+        """
+        kind = op[0]
+        if kind in _SET_OP_ATTRIBUTES:
+            setattr(self, _SET_OP_ATTRIBUTES[kind], op[2] if forward else op[1])
+            self._state_hash ^= zobrist_key((kind, op[1])) ^ zobrist_key((kind, op[2]))
+        elif kind == "visited":
+            loc = self._locations[op[1]]
+            visited = op[3] if forward else op[2]
+            if loc.visited != visited:  # the hash only changes with the flag
+                loc.visited = visited
+                self._state_hash ^= zobrist_key(("visited", op[1]))
+        elif kind == "item":
+            _, item, src, index, dst = op
+            self._state_hash ^= zobrist_key(("item", item.name, src)) ^ zobrist_key(("item", item.name, dst))
+            self._item_places[item.name] = dst if forward else src
+            src_list = self.inventory if src is None else self._locations[src].items
+            dst_list = self.inventory if dst is None else self._locations[dst].items
+            if forward:
+                del src_list[index]
+                dst_list.append(item if dst is None else item.name)
+            else:
+                dst_list.pop()
+                src_list.insert(index, item if src is None else item.name)
+        elif forward:  # "event"
+            self.event_log.add_event(Event(op[1], op[2]), op[3])
         else:
-            return f"LOCATION {loc.id_num}\n{loc.brief_description}"
+            self.event_log.remove_last_event()
 
     # -------------------------
     # Undo helpers
@@ -687,8 +1394,11 @@ class AdventureGame:
     def _make_snapshot(self) -> GameSnapshot:
         """Create a snapshot of the full game state for undo."""
         inv_names = [it.name for it in self.inventory]
-        loc_items = {loc_id: list(loc.items) for loc_id, loc in self._locations.items()}
-        visited = {loc_id: loc.visited for loc_id, loc in self._locations.items()}
+        loc_items = {}
+        visited = {}
+        for loc_id, items, was_visited in self._location_states():
+            loc_items[loc_id] = list(items)
+            visited[loc_id] = was_visited
         log_data = self.event_log.to_list()
         return GameSnapshot(
             current_location_id=self.current_location_id,
@@ -702,17 +1412,22 @@ class AdventureGame:
         )
 
     def _restore_snapshot(self, snap: GameSnapshot) -> None:
-        """Restore game state from snapshot."""
+        """Restore game state from snapshot (not recorded in the undo tree)."""
         self.current_location_id = snap.current_location_id
         self.moves_used = snap.moves_used
         self.score = snap.score
 
         self.ongoing = self.moves_used < self.max_moves
 
-        for loc_id, items_list in snap.location_items.items():
-            self._locations[loc_id].items = list(items_list)
-        for loc_id, was_visited in snap.visited.items():
-            self._locations[loc_id].visited = was_visited
+        if self._regions is not None:  # the snapshot only lists the locations not in their disk state
+            self._regions.reset()
+            for loc_id, items_list in snap.location_items.items():
+                self._regions.set_state(loc_id, items_list, snap.visited[loc_id])
+        else:
+            for loc_id, items_list in snap.location_items.items():
+                self._locations[loc_id].items = list(items_list)
+            for loc_id, was_visited in snap.visited.items():
+                self._locations[loc_id].visited = was_visited
 
         self.inventory = []
         for name in snap.inventory_names:
@@ -722,29 +1437,308 @@ class AdventureGame:
 
         self.event_log.load_from_list(snap.event_log_data)
         self.bahen_arena_won = snap.bahen_arena_won
+        self._state_hash = self.state_hash(recompute=True)
+        self._item_places = self._index_items()
+
+    def _push_undo(self, label: str = "") -> None:
+        """Start a new node in the undo tree: the changes made from now on belong to the next action.
+        (During process_batch every change belongs to the batch's node.)"""
+        if not self._in_batch:
+            self._undo_stack.begin(label)
+
+    def _revert_ops(self, ops: list[tuple]) -> None:
+        """Revert the ops of one undo node."""
+        for op in reversed(ops):
+            self._apply_op(op, False)
 
-    def _push_undo(self) -> None:
-        """Save current state so we can undo the next action."""
-        self._undo_stack.append(self._make_snapshot())
+    def _reapply_ops(self, ops: list[tuple]) -> None:
+        """Re-apply the ops of one undo node."""
+        for op in ops:
+            self._apply_op(op, True)
 
     def undo(self) -> str:
-        """Undo the previous action. Can be repeated."""
-        if not self._undo_stack:
+        """Undo the previous action. Can be repeated.
+
+        >>> game = AdventureGame('game_data.json', 5)
+        >>> for command in ["take lucky mug", "look", "undo", "look", "redo", "undo"]:
+        ...     _ = game.process_choice(command)
+        >>> game.state_hash() == game.state_hash(recompute=True)
+        True
+
+        Looking around is not an action: undo and redo step over moves only.
+        >>> game = AdventureGame('game_data.json', 6)
+        >>> [game.process_choice(command)[:10] for command in ["go east", "undo", "look", "undo", "redo"]]
+        ['LOCATION 1', 'Undid the ', 'LOCATION 6', 'Nothing to', 'Redid the ']
+        >>> game.current_location_id
+        1
+        >>> game = AdventureGame('game_data.json', 6)
+        >>> for command in ["go east", "go south", "undo", "undo", "go south", "look", "undo", "undo", "redo"]:
+        ...     _ = game.process_choice(command)
+        >>> game.current_location_id, game.undo_depth()
+        (5, 1)
+        """
+        ops = self._undo_stack.undo()
+        if ops is None:
             return "Nothing to undo."
-        snap = self._undo_stack.pop()
-        self._restore_snapshot(snap)
+        self._revert_ops(ops)
         return "Undid the previous action."
 
+    def redo(self, branch: int = -1) -> str:
+        """Redo an undone action: the most recent one by default, or the one numbered branch
+        (0 is the oldest) among the actions taken from the current state."""
+        ops = self._undo_stack.redo(branch)
+        if ops is None:
+            return "Nothing to redo."
+        self._reapply_ops(ops)
+        return "Redid the action."
+
+    def redo_branches(self) -> int:
+        """Return how many different actions can be redone from the current state."""
+        return self._undo_stack.branches()
+
+    def history_node(self) -> UndoNode:
+        """Return the undo tree node of the current state, to come back to later with jump_to.
+        Changes made after this (even before the next action) are kept out of the node."""
+        return self._undo_stack.mark()
+
+    def jump_to(self, node: UndoNode) -> bool:
+        """Move to the state of node (from history_node), undoing and redoing only the actions between
+        the two states. Return False if node has been evicted from the undo tree (or discarded by restart).
+        """
+        path = self._undo_stack.jump_to(node)
+        if path is None:
+            return False
+        to_revert, to_apply = path
+        for ops in to_revert:
+            self._revert_ops(ops)
+        for ops in to_apply:
+            self._reapply_ops(ops)
+        return True
+
+    def undo_depth(self) -> int:
+        """Return how many actions can currently be undone."""
+        return len(self._undo_stack)
+
+    def undo_stats(self) -> dict[str, int]:
+        """Return the undo tree's counters: entries held, undo depth, hits, evictions and bytes held."""
+        return self._undo_stack.stats()
+
+    def region_stats(self) -> dict[str, int]:
+        """Return the residency and paging counters of the region store (see RegionStore.stats), or an
+        empty dict if the whole world is loaded."""
+        return {} if self._regions is None else self._regions.stats()
+
+    def memory_report(self) -> dict[str, tuple[int, int]]:
+        """Return subsystem -> (bytes, number of objects) for this game's memory (see memory_accounting):
+        - world: Location and Item objects, with their descriptions, commands and item lists, and the
+          location graph
+        - frames: the pre-rendered location output
+        - initial_snapshot: the state restart goes back to
+        - undo_tree: the undo history (the ops of every node)
+        - event_log: the Event nodes
+        World data shared with other games (through the world cache) is counted here too.
+        """
+        return deep_sizes({
+            'world': [self._locations, self._items, self._graph],
+            'frames': [self._frames],
+            'initial_snapshot': [self._initial_snapshot],
+            'undo_tree': [self._undo_stack],
+            'event_log': [self.event_log]
+        })
+
+    def _location_states(self) -> Iterable[tuple[int, list[str], bool]]:
+        """Return (location id, items, visited) for every location, or with a region store, for every
+        location not in its disk state or with items (see RegionStore.states)."""
+        if self._regions is not None:
+            return self._regions.states()
+        return ((loc_id, loc.items, loc.visited) for loc_id, loc in self._locations.items())
+
+    def _index_items(self) -> dict[str, Optional[int]]:
+        """Return where each item is: the id of its location, or None if it is in the inventory."""
+        places: dict[str, Optional[int]] = {}
+        for loc_id, items, _ in self._location_states():
+            for name in items:
+                places[name] = loc_id
+        for item in self.inventory:
+            places[item.name] = None
+        return places
+
+    def _forget_frames(self, loc_ids: list[int]) -> None:
+        """Drop the pre-rendered output of loc_ids (whose region the region store evicted)."""
+        for loc_id in loc_ids:
+            self._frames.pop(loc_id, None)
+
+    # -------------------------
+    # State hashing
+    # -------------------------
+    def state_hash(self, recompute: bool = False) -> int:
+        """Return a 64-bit Zobrist hash of the current game state, for O(1) state comparisons and lookups.
+
+        The state is the current location, score, moves used, whether the game is ongoing, whether
+        the arena was won, which locations were visited and where every item is (not the order of
+        items within a location, and not the event log). Equal states have equal hashes, in every
+        process. The hash is updated incrementally with every change; recompute=True computes it
+        from scratch instead, in time proportional to the size of the world.
+
+        >>> game = AdventureGame('game_data.json', 5)
+        >>> for command in ["take lucky mug", "go north", "undo", "undo", "look", "undo", "redo", "go north"]:
+        ...     _ = game.process_choice(command)
+        >>> node = game.history_node()
+        >>> marked = game.state_hash()
+        >>> for command in ["undo", "go east", "look", "undo", "undo", "redo"]:
+        ...     _ = game.process_choice(command)
+        >>> game.state_hash() == game.state_hash(recompute=True)
+        True
+        >>> game.jump_to(node), game.state_hash() == marked == game.state_hash(recompute=True)
+        (True, True)
+        """
+        if not recompute:
+            return self._state_hash
+        h = 0
+        for kind, attribute in _SET_OP_ATTRIBUTES.items():
+            h ^= zobrist_key((kind, getattr(self, attribute)))
+        for loc_id, items, visited in self._location_states():
+            if visited:
+                h ^= zobrist_key(("visited", loc_id))
+            for name in items:
+                h ^= zobrist_key(("item", name, loc_id))
+        for item in self.inventory:
+            h ^= zobrist_key(("item", item.name, None))
+        return h
+
+    # -------------------------
+    # World hot-reload
+    # -------------------------
+    def apply_world_diff(self, diff: WorldDiff) -> None:
+        """Patch this game's locations and items in place with diff (see world_reload), keeping
+        where the items are and which locations were visited.
+
+        New locations and items start where the new data puts them (unless the game already has
+        the item somewhere). A removed location the player is currently in is kept (and so is the
+        start location); the items in any other removed location go to the inventory, and in the
+        state restart goes back to, to their start position. Removing locations or items clears
+        the undo history, which may refer to them.
+
+        The time taken is proportional to the size of diff and the number of items in the removed
+        locations: items are found through the item index, and the state hash is updated incrementally.
+
+        Raise ValueError (patching nothing) if the locations are paged in from a region store: paged
+        out locations are read back from the store on disk, which a patch can't change.
+
+        >>> import tempfile
+        >>> from region_store import build_region_store
+        >>> store = tempfile.mkdtemp()
+        >>> build_region_store('game_data.json', store, 5, region_size=4)
+        3
+        >>> game = AdventureGame(store, 5)
+        >>> game.apply_world_diff(WorldDiff(removed_locations=[1]))
+        Traceback (most recent call last):
+        ...
+        ValueError: a game paged in from a region store can't be patched by a hot reload
+        """
+        if self._regions is not None:
+            raise ValueError("a game paged in from a region store can't be patched by a hot reload")
+        snap = self._initial_snapshot
+        places, snap_places = self._item_places, self._initial_item_places
+
+        for loc_id, record in diff.changed_locations.items():
+            loc = self._locations[loc_id]
+            loc.brief_description = record['brief_description']
+            loc.long_description = record['long_description']
+            loc.available_commands = record['available_commands']
+            self._graph.set_commands(loc_id, record['available_commands'])
+            self._frames.pop(loc_id, None)
+
+        for loc_id, record in diff.added_locations.items():
+            names = [name for name in record['items'] if name not in places]
+            self._locations[loc_id] = Location(
+                loc_id, record['brief_description'], record['long_description'],
+                record['available_commands'], names
+            )
+            self._graph.set_commands(loc_id, record['available_commands'])
+            for name in names:
+                self._place_item(name, loc_id)
+            snap.location_items[loc_id] = [name for name in record['items'] if name not in snap_places]
+            snap_places.update((name, loc_id) for name in snap.location_items[loc_id])
+            snap.visited[loc_id] = False
+
+        for name, record in diff.changed_items.items():
+            item = self._find_item(name)
+            item.description = record['description']
+            item.start_position = record['start_position']
+            item.target_position = record['target_position']
+            item.target_points = record['target_points']
+
+        for name, record in diff.added_items.items():
+            self._items.append(Item(name, record['description'], record['start_position'],
+                                    record['target_position'], record['target_points']))
+            start = record['start_position']
+            if name not in places and self._locations.get(start) is not None:
+                self._locations[start].items.append(name)
+                self._place_item(name, start)
+            if name not in snap_places and start in snap.location_items:
+                snap.location_items[start].append(name)
+                snap_places[name] = start
+
+        for name in diff.removed_items:
+            if name in places:
+                loc_id = places.pop(name)
+                if loc_id is None:
+                    self.inventory = [item for item in self.inventory if item.name != name]
+                else:
+                    self._locations[loc_id].items.remove(name)
+                self._state_hash ^= zobrist_key(("item", name, loc_id))
+            if name in snap_places:
+                loc_id = snap_places.pop(name)
+                (snap.inventory_names if loc_id is None else snap.location_items[loc_id]).remove(name)
+        if diff.removed_items:
+            removed = set(diff.removed_items)
+            self._items = [item for item in self._items if item.name not in removed]
+
+        gone = set(diff.removed_locations) - {self.current_location_id, self._start_location_id}
+        for loc_id in gone:
+            loc = self._locations.pop(loc_id, None)
+            if loc is None:
+                continue
+            self._graph.remove_location(loc_id)
+            self._frames.pop(loc_id, None)
+            if loc.visited:
+                self._state_hash ^= zobrist_key(("visited", loc_id))
+            for name in loc.items:  # don't lose items the player left there
+                self.inventory.append(self._find_item(name))
+                self._state_hash ^= zobrist_key(("item", name, loc_id))
+                self._place_item(name, None)
+            for name in snap.location_items.pop(loc_id, []):
+                start = self._find_item(name).start_position
+                if start in gone or start not in snap.location_items:
+                    snap.inventory_names.append(name)
+                    snap_places[name] = None
+                else:
+                    snap.location_items[start].append(name)
+                    snap_places[name] = start
+            snap.visited.pop(loc_id, None)
+
+        if diff.removed_items or diff.removed_locations:
+            self._undo_stack.clear()
+
+    def _place_item(self, name: str, loc_id: Optional[int]) -> None:
+        """Record that the item named name has been put at loc_id (None: the inventory) by a world reload,
+        outside the undo history, in the item index and the state hash."""
+        self._item_places[name] = loc_id
+        self._state_hash ^= zobrist_key(("item", name, loc_id))
+
     # -------------------------
     # Restart feature
     # -------------------------
     def restart(self) -> str:
         """Restart the game back to the initial state."""
+        self._end_arena()
         self._restore_snapshot(self._initial_snapshot)
         self._undo_stack.clear()
 
         # Rebuild initial snapshot (safe if user restarts multiple times)
         self._initial_snapshot = self._make_snapshot()
+        self._initial_item_places = dict(self._item_places)
 
         return "Game restarted.\n" + self.describe_current_location(force_long=True)
 
@@ -758,43 +1752,56 @@ if __name__ == "__main__":
     #     'max-line-length': 120,
     #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
     # })
+    import sys
+    from replay import SessionRecorder
+
     game = AdventureGame('game_data.json', 6)  # load data, setting initial location ID to 1
-    menu = ["look", "inventory", "score", "log", "undo", "restart", "quit"]  # Regular menu options available at each location
+    # Optional: "python adventure.py --record session.json" saves the session for replay.py
+    recorder = SessionRecorder(game, 'game_data.json', 6) if "--record" in sys.argv else None
     choice = None
+    io = game.io  # everything for a turn is buffered here and written once, together with the prompt
 
-    show_location = True
+    io.write(game.describe_current_location(force_long=True) + "\n")  # the start is already visited
+    show_location = False
     while game.ongoing:
-        location = game.get_location()
-
         # NOTE: We add the initial event in __init__ and add "go" events inside AdventureGame.go().
         # Keeping the original auto-add block would cause duplicated events in the log, so it is commented out.
 
+        arena_prompt = game.arena_prompt()
+        if arena_prompt is not None:
+            # The Bahen arena is in progress: every line is arena input, with no menu validation
+            try:
+                choice = io.read(arena_prompt)
+            except EOFError:
+                choice = "quit"
+            result = game.process_choice(choice)
+            if result:
+                io.write(result + "\n")
+            continue
+
         if show_location:
-            print(game.describe_current_location(force_long=False))
+            io.write(game.describe_current_location(force_long=False) + "\n")
             show_location = False
 
-        print("What to do? Choose from: look, inventory, score, log, undo, restart, quit")
-        if location.available_commands:
-            print("From here, you can also:")
-            for action in location.available_commands:
-                print("-", action)
+        io.write(game.get_frame().menu)
 
-        choice = input("\nEnter action: ").lower().strip()
+        choice = io.read("\nEnter action: ").lower().strip()
 
-        while (
-            choice not in menu
-            and not choice.startswith("take ")
-            and not choice.startswith("drop ")
-            and not choice.startswith("go ")
-        ):
-            print("That was an invalid option. Please try again. :((( ")
-            choice = input("\nEnter action: ").lower().strip()
+        while not is_menu_choice(choice):
+            io.write("That was an invalid option. Please try again. :((( \n")
+            choice = io.read("\nEnter action: ").lower().strip()
 
-        print("========")
-        print("You decided to:", choice)
+        io.write("========\n")
+        io.line("You decided to:", choice)
+
+        if choice == "log":
+            # Stream the log a chunk at a time instead of building it as one string
+            game.event_log.write_to(io)
+            continue
 
         result = game.process_choice(choice)
-        print(result)
+        if result:  # (empty when take started the Bahen arena)
+            io.write(result + "\n")
 
         if choice.startswith("go "):
             show_location = False
@@ -802,7 +1809,14 @@ if __name__ == "__main__":
         if choice == "undo" and result != "Nothing to undo.":
             show_location = True
 
+        if choice == "redo" and result != "Nothing to redo.":
+            show_location = True
+
         if choice == "restart":
             show_location = True
 
         # TODO: Add in code to deal with special locations (e.g. puzzles) as needed for your game
+
+    io.flush()
+    if recorder is not None:
+        recorder.finish().save(sys.argv[sys.argv.index("--record") + 1])
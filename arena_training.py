@@ -0,0 +1,211 @@
+"""CSC111 Project 1: Text Adventure Game - Arena Policy Training
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module trains the "trained" CSSU AI of the Evolution Arena offline, with
+tabular Q-learning over the arena's discrete state (points each side still needs, both
+energies and the opponent's last move; see adventure.arena_policy_state). Rounds are
+played with the game's own rules (adventure.arena_play_round), against a mix of stand-in
+human opponents: uniformly random moves, the classic and adaptive AIs, and the policy
+being trained (self-play).
+
+The greedy policy is saved as one byte per state (the index of the move to play), so
+the game can load it lazily and choose each move with a single table lookup.
+
+Usage: python arena_training.py [episodes] [seed] [output file]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import random
+from array import array
+from typing import Callable, Optional
+
+from adventure import (ALL_MOVES, ARENA_POLICY_FILE, ARENA_POLICY_MAX_ENERGY, ARENA_POLICY_STATES,
+                       ARENA_TARGET_POINTS, ArenaOpponentModel, ArenaPlayer, Move, arena_ai_choose,
+                       arena_ai_choose_adaptive, arena_energy_cost, arena_enforce_energy, arena_play_round,
+                       arena_policy_state)
+
+# The stand-in human opponents the policy is trained and evaluated against
+OPPONENTS: tuple[str, ...] = ("random", "classic", "adaptive", "self")
+
+# A match that hasn't ended after this many rounds is scored as a draw
+MAX_ROUNDS = 60
+
+# AFFORDABLE[e] lists the indexes (in ALL_MOVES) of the moves that cost at most e energy
+AFFORDABLE: tuple[tuple[int, ...], ...] = tuple(
+    tuple(i for i, m in enumerate(ALL_MOVES) if arena_energy_cost(m) <= e)
+    for e in range(ARENA_POLICY_MAX_ENERGY + 1)
+)
+
+_N_MOVES = len(ALL_MOVES)
+
+
+def _state(me: ArenaPlayer, them: ArenaPlayer) -> int:
+    """Return the policy state of me, playing against them."""
+    return arena_policy_state(ARENA_TARGET_POINTS - me.points, ARENA_TARGET_POINTS - them.points,
+                              me.energy, them.energy, them.last_move)
+
+
+def _best(q: array, state: int, energy: int) -> tuple[int, float]:
+    """Return the affordable move (as an index into ALL_MOVES) with the highest value in state, and that value."""
+    base = state * _N_MOVES
+    best = -1
+    best_value = 0.0
+    for i in AFFORDABLE[min(energy, ARENA_POLICY_MAX_ENERGY)]:
+        if best < 0 or q[base + i] > best_value:
+            best = i
+            best_value = q[base + i]
+    return best, best_value
+
+
+def _explore(q: array, state: int, energy: int, epsilon: float, rng: random.Random) -> int:
+    """Return an epsilon-greedy affordable move (as an index into ALL_MOVES) in state."""
+    if rng.random() < epsilon:
+        return rng.choice(AFFORDABLE[min(energy, ARENA_POLICY_MAX_ENERGY)])
+    return _best(q, state, energy)[0]
+
+
+def _update(q: array, state: int, move: int, me: ArenaPlayer, them: ArenaPlayer, alpha: float) -> None:
+    """Apply one Q-learning update for playing move in state, now that the round has been played."""
+    if me.points >= ARENA_TARGET_POINTS:
+        target = 1.0
+    elif them.points >= ARENA_TARGET_POINTS:
+        target = -1.0
+    else:
+        target = _best(q, _state(me, them), me.energy)[1]
+    k = state * _N_MOVES + move
+    q[k] += alpha * (target - q[k])
+
+
+def _opponent_move(kind: str, human: ArenaPlayer, ai: ArenaPlayer, model: Optional[ArenaOpponentModel],
+                   rng: random.Random) -> Move:
+    """Return the move of a stand-in human of the given kind (not "self"), enforced to be affordable."""
+    if kind == "random":
+        desired = ALL_MOVES[rng.choice(AFFORDABLE[min(human.energy, ARENA_POLICY_MAX_ENERGY)])]
+    elif kind == "classic":
+        desired = arena_ai_choose(human, ai)
+    else:
+        desired = arena_ai_choose_adaptive(human, ai, model)
+    return arena_enforce_energy(human, desired)[0]
+
+
+def train_policy(episodes: int = 300_000, seed: int = 0, alpha: float = 0.1, epsilon: float = 0.1,
+                 opponents: tuple[str, ...] = OPPONENTS) -> array:
+    """Return a policy table (one byte per state: the index in ALL_MOVES of the move to play) learned by
+    Q-learning over the given number of matches, each against an opponent picked from opponents.
+
+    In self-play matches both sides learn from the round.
+    """
+    rng = random.Random(seed)
+    random.seed(seed)  # the classic and adaptive opponents draw from the global generator
+    q = array('d', bytes(8 * ARENA_POLICY_STATES * _N_MOVES))
+
+    for _ in range(episodes):
+        kind = rng.choice(opponents)
+        ai = ArenaPlayer(name="CSSU AI")
+        human = ArenaPlayer(name="You")
+        model = ArenaOpponentModel() if kind == "adaptive" else None
+
+        for _ in range(MAX_ROUNDS):
+            ai_state = _state(ai, human)
+            ai_move = _explore(q, ai_state, ai.energy, epsilon, rng)
+            if kind == "self":
+                human_state = _state(human, ai)
+                human_move = _explore(q, human_state, human.energy, epsilon, rng)
+                m_h = ALL_MOVES[human_move]
+            else:
+                m_h = _opponent_move(kind, human, ai, model, rng)
+
+            if model is not None:
+                model.observe(ALL_MOVES[ai_move], human.last_move)
+            arena_play_round(human, m_h, ai, ALL_MOVES[ai_move])
+
+            _update(q, ai_state, ai_move, ai, human, alpha)
+            if kind == "self":
+                _update(q, human_state, human_move, human, ai, alpha)
+            if ai.points >= ARENA_TARGET_POINTS or human.points >= ARENA_TARGET_POINTS:
+                break
+
+    policy = array('B', bytes(ARENA_POLICY_STATES))
+    for state in range(ARENA_POLICY_STATES):
+        # The best move with the most energy the state can have; the game enforces affordability
+        energy = (state // (_N_MOVES + 1) // (ARENA_POLICY_MAX_ENERGY + 1)) % (ARENA_POLICY_MAX_ENERGY + 1)
+        policy[state] = _best(q, state, energy)[0]
+    return policy
+
+
+def save_policy(policy: array, filename: str = ARENA_POLICY_FILE) -> None:
+    """Write policy to filename in the format read by adventure.arena_load_policy."""
+    with open(filename, 'wb') as f:
+        policy.tofile(f)
+
+
+def policy_chooser(policy: array) -> Callable[[ArenaPlayer, ArenaPlayer], Move]:
+    """Return an AI choice function (like adventure.arena_ai_choose) that plays policy."""
+    def choose(ai: ArenaPlayer, opponent: ArenaPlayer) -> Move:
+        return ALL_MOVES[policy[_state(ai, opponent)]]
+    return choose
+
+
+def evaluate(choose: Callable[..., Move], opponent: str, matches: int = 2000, seed: int = 1,
+             modelling: bool = False) -> float:
+    """Return the fraction of matches an AI playing choose(ai, human) wins against the stand-in human
+    opponent (one of OPPONENTS other than "self"); matches that reach MAX_ROUNDS count as not won.
+
+    If modelling, the AI plays choose(ai, human, model) instead, with an ArenaOpponentModel of the
+    human's moves that is new for each match (e.g. choose=arena_ai_choose_adaptive).
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    wins = 0
+    for _ in range(matches):
+        ai = ArenaPlayer(name="CSSU AI")
+        human = ArenaPlayer(name="You")
+        model = ArenaOpponentModel() if opponent == "adaptive" else None
+        ai_model = ArenaOpponentModel() if modelling else None
+        for _ in range(MAX_ROUNDS):
+            desired = choose(ai, human) if ai_model is None else choose(ai, human, ai_model)
+            m_a = arena_enforce_energy(ai, desired)[0]
+            m_h = _opponent_move(opponent, human, ai, model, rng)
+            if model is not None:
+                model.observe(m_a, human.last_move)
+            if ai_model is not None:
+                ai_model.observe(m_h, ai.last_move)
+            arena_play_round(human, m_h, ai, m_a)
+            if ai.points >= ARENA_TARGET_POINTS or human.points >= ARENA_TARGET_POINTS:
+                break
+        wins += ai.points >= ARENA_TARGET_POINTS
+    return wins / matches
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    n_episodes = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    train_seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    out_file = sys.argv[3] if len(sys.argv) > 3 else ARENA_POLICY_FILE
+
+    start = time.perf_counter()
+    trained = train_policy(n_episodes, train_seed)
+    print(f"Trained on {n_episodes} matches in {time.perf_counter() - start:.1f}s")
+    save_policy(trained, out_file)
+    print(f"Wrote {len(trained)} states to {out_file}")
+
+    ais = {"classic": arena_ai_choose, "trained": policy_chooser(trained)}
+    for against in OPPONENTS[:-1]:
+        rates = ", ".join(f"{name} {evaluate(ai_choose, against):.1%}" for name, ai_choose in ais.items())
+        rates += f", adaptive {evaluate(arena_ai_choose_adaptive, against, modelling=True):.1%}"
+        print(f"win rate against {against} opponent: {rates}")
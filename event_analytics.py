@@ -0,0 +1,249 @@
+"""CSC111 Project 1: Text Adventure Game - Cross-Session Event Analytics
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module exports the event logs of many play sessions to a columnar on-disk
+format and computes aggregate statistics over them: visit counts, transition counts and
+probabilities, common routes, drop-off points and time-to-win.
+
+An export is a directory holding one raw binary file per column (native-endian int32, as
+written by the array module), plus a small JSON file with the command intern table:
+    - session.i32, step.i32, location.i32, command.i32: one entry per event (the command
+      is the id of the command that reached the event, or 0 for a session's first event)
+    - session_ids.i32, offsets.i64, outcomes.i8: one entry per session (offsets has one
+      more: session k's events are offsets[k]..offsets[k + 1] - 1; an outcome is 1 for a
+      win, 0 otherwise and -1 if unknown)
+    - columns.json: {"commands": [...], "events": n, "sessions": m}
+
+The aggregations run over whole columns with C-level iteration (collections.Counter over
+zip), and then correct for the few windows that cross session boundaries.
+
+Usage:
+    python event_analytics.py export <recordings.jsonl> <output dir>
+    python event_analytics.py report <export dir>
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import json
+import os
+from array import array
+from collections import Counter
+from itertools import islice
+from typing import Iterable, Optional
+
+from adventure import AdventureGame
+from event_logger import EventList
+
+# Typecodes of the on-disk columns (int32 for events, int64 offsets, int8 outcomes)
+EVENT_COLUMNS: tuple[str, ...] = ("session", "step", "location", "command")
+_TYPECODES: dict[str, str] = {
+    "session": "i", "step": "i", "location": "i", "command": "i",
+    "session_ids": "i", "offsets": "q", "outcomes": "b"
+}
+_SUFFIXES: dict[str, str] = {"i": ".i32", "q": ".i64", "b": ".i8"}
+
+
+class EventColumns:
+    """The event logs of many sessions, stored column by column.
+
+    Instance Attributes:
+        - session, step, location, command: the event columns (one entry per event)
+        - session_ids, offsets, outcomes: the session columns (see the module docstring)
+        - commands: the command intern table: command id -> command ('' is id 0)
+
+    Representation Invariants:
+        - len(self.session) == len(self.step) == len(self.location) == len(self.command)
+        - len(self.offsets) == len(self.session_ids) + 1
+        - self.offsets[-1] == len(self.session)
+    """
+    session: array
+    step: array
+    location: array
+    command: array
+    session_ids: array
+    offsets: array
+    outcomes: array
+    commands: list[str]
+
+    # Private Instance Attributes:
+    #   - _command_ids: command -> its id in the intern table
+
+    def __init__(self) -> None:
+        """Initialize an export with no sessions."""
+        for name, typecode in _TYPECODES.items():
+            setattr(self, name, array(typecode))
+        self.offsets.append(0)
+        self.commands = [""]
+        self._command_ids = {"": 0}
+
+    def __len__(self) -> int:
+        """Return the number of events."""
+        return len(self.session)
+
+    def session_count(self) -> int:
+        """Return the number of sessions."""
+        return len(self.session_ids)
+
+    def add_session(self, session_id: int, events: EventList, won: Optional[bool] = None) -> None:
+        """Append the events of one session (won is whether it was won, if known). Empty logs are skipped."""
+        if events.is_empty():
+            return
+        command_ids = self._command_ids
+        command = ""
+        for step, event in enumerate(events):
+            cid = command_ids.get(command)
+            if cid is None:
+                cid = command_ids[command] = len(self.commands)
+                self.commands.append(command)
+            self.session.append(session_id)
+            self.step.append(step)
+            self.location.append(event.id_num)
+            self.command.append(cid)
+            command = event.next_command or ""
+        self.session_ids.append(session_id)
+        self.offsets.append(len(self.session))
+        self.outcomes.append(-1 if won is None else int(won))
+
+    def save(self, dirname: str) -> None:
+        """Write the columns to the directory dirname (created if needed)."""
+        os.makedirs(dirname, exist_ok=True)
+        for name, typecode in _TYPECODES.items():
+            with open(os.path.join(dirname, name + _SUFFIXES[typecode]), 'wb') as f:
+                getattr(self, name).tofile(f)
+        with open(os.path.join(dirname, "columns.json"), 'w', encoding='utf-8') as f:
+            json.dump({"commands": self.commands, "events": len(self), "sessions": self.session_count()}, f)
+
+    @staticmethod
+    def load(dirname: str) -> EventColumns:
+        """Return the columns saved in the directory dirname."""
+        columns = EventColumns()
+        with open(os.path.join(dirname, "columns.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        columns.commands = meta["commands"]
+        columns._command_ids = {command: i for i, command in enumerate(columns.commands)}
+        for name, typecode in _TYPECODES.items():
+            column = array(typecode)
+            path = os.path.join(dirname, name + _SUFFIXES[typecode])
+            with open(path, 'rb') as f:
+                column.fromfile(f, os.path.getsize(path) // column.itemsize)
+            setattr(columns, name, column)
+        return columns
+
+
+def game_won(game: AdventureGame) -> bool:
+    """Return whether every item of game is at its target location."""
+    return all(item.name in game.get_location(item.target_position).items for item in game.get_all_items())
+
+
+def export_event_logs(sessions: Iterable[tuple[EventList, Optional[bool]]], dirname: Optional[str] = None
+                      ) -> EventColumns:
+    """Return the columns of the given (event log, won) sessions, numbered from 0 in order,
+    and save them to dirname if it is given."""
+    columns = EventColumns()
+    for session_id, (events, won) in enumerate(sessions):
+        columns.add_session(session_id, events, won)
+    if dirname is not None:
+        columns.save(dirname)
+    return columns
+
+
+# -------------------------
+# Aggregations
+# -------------------------
+def visit_counts(columns: EventColumns) -> Counter:
+    """Return how many times each location id was visited (appears in an event), over all sessions."""
+    return Counter(columns.location)
+
+
+def route_counts(columns: EventColumns, length: int = 2) -> Counter:
+    """Return how many times each route of <length> consecutive location ids was taken, within a session.
+
+    Preconditions:
+        - length >= 1
+    """
+    loc = columns.location
+    routes = Counter(zip(*(islice(loc, k, None) for k in range(length))))
+    # Remove the windows that straddle two (or more) sessions, each once
+    straddling = set()
+    for boundary in islice(columns.offsets, 1, len(columns.offsets) - 1):
+        straddling.update(range(max(0, boundary - length + 1), min(boundary, len(loc) - length + 1)))
+    for start in straddling:
+        window = tuple(loc[start:start + length])
+        routes[window] -= 1
+        if routes[window] == 0:
+            del routes[window]
+    return routes
+
+
+def transition_counts(columns: EventColumns) -> Counter:
+    """Return how many times each (from location id, to location id) move was made, within a session."""
+    return route_counts(columns, 2)
+
+
+def transition_probabilities(columns: EventColumns) -> dict[int, dict[int, float]]:
+    """Return the (sparse) transition matrix: from location id -> to location id -> the fraction
+    of the moves made from the first location that went to the second."""
+    totals: Counter = Counter()
+    counts = transition_counts(columns)
+    for (src, _), count in counts.items():
+        totals[src] += count
+    matrix: dict[int, dict[int, float]] = {}
+    for (src, dst), count in counts.items():
+        matrix.setdefault(src, {})[dst] = count / totals[src]
+    return matrix
+
+
+def common_routes(columns: EventColumns, length: int = 3, top: int = 10) -> list[tuple[tuple[int, ...], int]]:
+    """Return the <top> most common routes of <length> consecutive locations, with their counts."""
+    return route_counts(columns, length).most_common(top)
+
+
+def drop_off_points(columns: EventColumns) -> Counter:
+    """Return how many sessions that were not won (or whose outcome is unknown) ended at each location id."""
+    loc = columns.location
+    return Counter(loc[end - 1] for end, outcome in zip(islice(columns.offsets, 1, None), columns.outcomes)
+                   if outcome != 1)
+
+
+def time_to_win(columns: EventColumns) -> Counter:
+    """Return how many won sessions took each number of moves (events after the first)."""
+    offsets = columns.offsets
+    return Counter(offsets[k + 1] - offsets[k] - 1 for k, outcome in enumerate(columns.outcomes) if outcome == 1)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from replay import load_recordings, replay_session
+
+    if sys.argv[1] == "export":
+        start_time = time.perf_counter()
+        games = (replay_session(rec) for rec in load_recordings(sys.argv[2]))
+        exported = export_event_logs(((g.event_log, game_won(g)) for g in games), sys.argv[3])
+        print(f"Exported {len(exported)} events of {exported.session_count()} sessions "
+              f"in {time.perf_counter() - start_time:.2f}s")
+    else:
+        start_time = time.perf_counter()
+        loaded = EventColumns.load(sys.argv[2])
+        print(f"Loaded {len(loaded)} events of {loaded.session_count()} sessions "
+              f"in {time.perf_counter() - start_time:.2f}s")
+        start_time = time.perf_counter()
+        print("Most visited locations:", visit_counts(loaded).most_common(10))
+        print("Most common moves:", transition_counts(loaded).most_common(10))
+        print("Most common routes:", common_routes(loaded))
+        print("Drop-off points:", drop_off_points(loaded).most_common(10))
+        print("Moves to win:", sorted(time_to_win(loaded).items()))
+        print(f"Aggregated in {time.perf_counter() - start_time:.2f}s")
@@ -22,7 +22,7 @@ This file is Copyright (c) 2026 CSC111 Teaching Team
 """
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, Optional, Protocol
 
 
 # Note: We have completed the Event class for you. Do NOT modify it here for A1.
@@ -45,6 +45,13 @@ class Event:
     prev: Optional[Event] = None
 
 
+class _Writable(Protocol):
+    """Anything with a write(str) method, e.g. a text file, sys.stdout or a game_io.GameIO."""
+
+    def write(self, text: str) -> object:
+        """Write text."""
+
+
 class EventList:
     """
     A linked list of game events.
@@ -66,27 +73,61 @@ class EventList:
         self.first = None
         self.last = None
 
-    def display_events(self) -> None:
-        """Display all events in chronological order."""
+    def __iter__(self) -> Iterator[Event]:
+        """Iterate over the events in chronological order, without copying them."""
         curr = self.first
         while curr is not None:
-            # Show the command that led FROM this event to the next.
-            # If curr is the last event, next_command will be None.
-            cmd = curr.next_command if curr.next_command is not None else "(end)"
-            print(f"Location: {curr.id_num}, Command: {cmd}")
+            yield curr
             curr = curr.next
 
+    def iter_lines(self) -> Iterator[str]:
+        """Lazily generate one line (without a newline) per event, in chronological order,
+        in the format used by display_events and get_events_as_string."""
+        for event in self:
+            # Show the command that led FROM this event to the next.
+            # If it is the last event, next_command will be None.
+            cmd = event.next_command if event.next_command is not None else "(end)"
+            yield f"Location: {event.id_num}, Command: {cmd}"
+
+    def write_to(self, stream: _Writable, chunk_size: int = 256) -> int:
+        """Write get_events_as_string() followed by a newline to stream, <chunk_size> lines
+        per write call, and return the number of events written.
+
+        Only one chunk is held in memory at a time. If stream has a flush method, it is
+        called after every chunk, so a game_io.GameIO emits (and can page) each chunk as it goes.
+
+        Preconditions:
+            - chunk_size >= 1
+        """
+        flush = getattr(stream, 'flush', None)
+        count = 0
+        chunk = []
+        for line in self.iter_lines():
+            chunk.append(line)
+            if len(chunk) == chunk_size:
+                stream.write("\n".join(chunk) + "\n")
+                count += len(chunk)
+                chunk.clear()
+                if flush is not None:
+                    flush()
+        if chunk or count == 0:
+            stream.write("\n".join(chunk) + "\n" if chunk else "(no events)\n")
+            count += len(chunk)
+            if flush is not None:
+                flush()
+        return count
+
+    def display_events(self) -> None:
+        """Display all events in chronological order."""
+        for line in self.iter_lines():
+            print(line)
+
     def get_events_as_string(self) -> str:
         """Return a string showing all events in chronological order.
         This is useful for Project 1 (so the game manager can print it).
         """
-        lines = []
-        curr = self.first
-        while curr is not None:
-            cmd = curr.next_command if curr.next_command is not None else "(end)"
-            lines.append(f"Location: {curr.id_num}, Command: {cmd}")
-            curr = curr.next
-        return "\n".join(lines) if lines else "(no events)"
+        text = "\n".join(self.iter_lines())
+        return text if text else "(no events)"
 
     def is_empty(self) -> bool:
         """Return whether this event list is empty."""
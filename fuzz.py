@@ -0,0 +1,242 @@
+"""CSC111 Project 1: Text Adventure Game - Random-Walk Fuzzer
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module drives AdventureGame.process_choice with seeded random walks over
+valid and invalid commands (mixing in undo, redo and restart), checks the game's invariants
+after every step, and reports sustained commands/sec and memory growth. While the Bahen
+arena is in progress, the walk plays random arena input instead. Between commands the walk
+also marks undo history nodes and jumps back to them, checking that each jump restores the
+state the node was marked in.
+
+Usage: python fuzz.py [steps] [seed] [max_moves]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+from adventure import AdventureGame
+from game_io import ScriptedIO
+from undo_history import UndoNode
+
+INVALID_COMMANDS: tuple[str, ...] = ("dance", "go nowhere", "take ghost", "drop ghost", "", "take", "drop", "go")
+QUERY_COMMANDS: tuple[str, ...] = ("look", "inventory", "score", "log")
+ARENA_INPUTS: tuple[str, ...] = ("rock 1", "rock 2", "paper 3", "scissors2", "shadow 1", "rules", "banana",
+                                 "try again", "quit")
+
+# The most undo history nodes a fuzz run keeps marked to jump back to
+MAX_MARKS = 16
+
+
+@dataclass
+class FuzzSample:
+    """Throughput and memory measured at one point of a fuzz run.
+
+    Instance Attributes:
+        - step: the number of commands run so far
+        - commands_per_sec: commands/sec over the interval ending at this sample
+        - traced_bytes: memory currently allocated by Python (0 unless memory tracing is on)
+        - undo_depth: the game's undo depth at this sample
+        - undo_bytes: the (approximate) bytes held by the undo tree at this sample
+    """
+    step: int
+    commands_per_sec: float
+    traced_bytes: int
+    undo_depth: int
+    undo_bytes: int
+
+
+@dataclass
+class FuzzReport:
+    """The result of a fuzz run.
+
+    Instance Attributes:
+        - steps: the number of commands run
+        - elapsed: the wall-clock time of the run, in seconds
+        - failures: (step, command, problem) for every invariant violation found
+        - samples: periodic throughput/memory samples
+        - restarts: how many times the game was restarted (explicitly or after it ended)
+    """
+    steps: int = 0
+    elapsed: float = 0.0
+    failures: list[tuple[int, str, str]] = field(default_factory=list)
+    samples: list[FuzzSample] = field(default_factory=list)
+    restarts: int = 0
+
+    def commands_per_sec(self) -> float:
+        """Return the sustained commands/sec of the whole run."""
+        return self.steps / self.elapsed if self.elapsed > 0 else 0.0
+
+    def memory_growth(self) -> int:
+        """Return the traced memory of the last sample minus that of the first (0 without samples)."""
+        if len(self.samples) < 2:
+            return 0
+        return self.samples[-1].traced_bytes - self.samples[0].traced_bytes
+
+
+def check_invariants(game: AdventureGame) -> list[str]:
+    """Return a description of every invariant game currently violates.
+
+    - The score is 1 per take in the event log plus target_points per drop at the item's target.
+    - Every item is in exactly one place (the inventory or one location).
+    - The event log has one event per move used plus the starting event (the move that
+      runs out the clock is counted but not logged).
+    - The incrementally updated state hash equals the hash computed from scratch.
+    """
+    problems = []
+    items = {item.name: item for item in game.get_all_items()}
+
+    log = game.event_log.to_list()
+    expected_score = 0
+    for i in range(len(log) - 1):
+        command = log[i][2]
+        where = log[i + 1][0]
+        if command.startswith("take "):
+            expected_score += 1
+        elif command.startswith("drop "):
+            item = items.get(command[5:])
+            if item is not None and item.target_position == where:
+                expected_score += item.target_points
+    if expected_score != game.score:
+        problems.append(f"score is {game.score} but the event log accounts for {expected_score}")
+
+    places = {name: 0 for name in items}
+    for name in game.show_inventory():
+        places[name] = places.get(name, 0) + 1
+    for loc in game.get_all_locations():
+        for name in loc.items:
+            places[name] = places.get(name, 0) + 1
+    for name, count in places.items():
+        if count != 1:
+            problems.append(f"item {name!r} is in {count} places")
+
+    ran_out = not game.ongoing and game.moves_used >= game.max_moves
+    if len(log) != game.moves_used + 1 and not (ran_out and len(log) == game.moves_used):
+        problems.append(f"event log has {len(log)} events after {game.moves_used} moves")
+
+    if game.state_hash() != game.state_hash(recompute=True):
+        problems.append("incremental state hash differs from the recomputed one")
+
+    return problems
+
+
+def random_command(game: AdventureGame, rng: random.Random, invalid_rate: float,
+                   undo_rate: float, restart_rate: float) -> str:
+    """Return a random command for the current state of game (random arena input if the arena is in progress)."""
+    if game.arena_prompt() is not None:
+        return rng.choice(ARENA_INPUTS)
+    r = rng.random()
+    if r < restart_rate:
+        return "restart"
+    r -= restart_rate
+    if r < undo_rate:
+        return "undo" if rng.random() < 0.7 else "redo"
+    r -= undo_rate
+    if r < invalid_rate:
+        return rng.choice(INVALID_COMMANDS)
+
+    loc = game.get_location()
+    options = list(game.available_commands())
+    options.extend("take " + name for name in loc.items)
+    options.extend("drop " + name for name in game.show_inventory())
+    if not options or rng.random() < 0.05:
+        return rng.choice(QUERY_COMMANDS)
+    return rng.choice(options)
+
+
+def fuzz(game_data_file: str = 'game_data.json', initial_location_id: int = 6, steps: int = 100_000,
+         seed: int = 0, max_moves: int = 30, invalid_rate: float = 0.1, undo_rate: float = 0.1,
+         restart_rate: float = 0.001, jump_rate: float = 0.1, check_every: int = 1, sample_every: int = 10_000,
+         trace_memory: bool = False) -> FuzzReport:
+    """Run a seeded random walk of <steps> commands and return its FuzzReport.
+
+    Invariants are checked every <check_every> steps (0 disables checking), and a sample is
+    taken every <sample_every> steps. Arena matches get random input (see ARENA_INPUTS). A game
+    that ends is restarted. Before a step, with probability jump_rate, the current undo history
+    node is marked or the game jumps to a marked node (a jump that lands on a different state
+    hash than the node was marked with is a failure).
+    """
+    rng = random.Random(seed)
+    random.seed(seed)  # the game draws each arena match's seed from the global generator
+    game = AdventureGame(game_data_file, initial_location_id, max_moves, io=ScriptedIO([], keep_output=False))
+    report = FuzzReport()
+    marks: list[tuple[UndoNode, int]] = []  # marked history nodes, with the state hash they were marked in
+
+    if trace_memory:
+        tracemalloc.start()
+    start = interval_start = time.perf_counter()
+
+    for step in range(1, steps + 1):
+        if rng.random() < jump_rate and game.arena_prompt() is None:
+            if marks and rng.random() < 0.5:
+                node, marked_hash = rng.choice(marks)
+                if game.jump_to(node) and game.state_hash() != marked_hash:
+                    report.failures.append((step, "jump", "jumping to a marked node did not restore its state"))
+            else:
+                marks.append((game.history_node(), game.state_hash()))
+                del marks[:-MAX_MARKS]
+
+        command = random_command(game, rng, invalid_rate, undo_rate, restart_rate)
+        game.process_choice(command)
+        game.io.flush()
+
+        if check_every and step % check_every == 0:
+            for problem in check_invariants(game):
+                report.failures.append((step, command, problem))
+
+        if command == "restart":
+            report.restarts += 1
+            marks.clear()  # the history they were in is gone
+        elif not game.ongoing:
+            game.restart()
+            report.restarts += 1
+            marks.clear()
+
+        if step % sample_every == 0:
+            now = time.perf_counter()
+            traced = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+            report.samples.append(FuzzSample(step, sample_every / (now - interval_start), traced,
+                                             game.undo_depth(), game.undo_stats()['bytes_held']))
+            interval_start = now
+
+    report.elapsed = time.perf_counter() - start
+    report.steps = steps
+    if trace_memory:
+        tracemalloc.stop()
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [int(a) for a in sys.argv[1:]]
+    n_steps = args[0] if len(args) > 0 else 100_000
+    run_seed = args[1] if len(args) > 1 else 0
+    run_max_moves = args[2] if len(args) > 2 else 30
+
+    result = fuzz(steps=n_steps, seed=run_seed, max_moves=run_max_moves,
+                  sample_every=max(1, n_steps // 10), trace_memory=True)
+    for sample in result.samples:
+        print(f"step {sample.step:>10}: {sample.commands_per_sec:>10.0f} cmd/s, "
+              f"{sample.traced_bytes:>12} bytes traced, undo depth {sample.undo_depth} "
+              f"({sample.undo_bytes} bytes of undo history)")
+    print(f"{result.steps} commands in {result.elapsed:.2f}s ({result.commands_per_sec():.0f} cmd/s), "
+          f"{result.restarts} restarts, memory growth {result.memory_growth()} bytes")
+    for failure in result.failures[:20]:
+        print("INVARIANT FAILED:", failure)
+    print(f"{len(result.failures)} invariant failures")
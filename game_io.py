@@ -0,0 +1,201 @@
+"""CSC111 Project 1: Text Adventure Game - Input/Output Backends
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the input/output backends used by the game loop and the
+Evolution Arena. The game never calls input() or print() directly; it reads and writes
+through a GameIO object, so the same game can be played in a terminal, driven from a
+script (tests, replays) or served to remote players.
+
+Output for a turn is collected in memory and emitted in a single write when the game
+flushes it (right before it waits for the next line of input).
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import sys
+import threading
+from collections import deque
+from typing import Iterable, Optional, TextIO
+
+
+class InputPending(EOFError):
+    """Raised by NonBlockingIO.read when no line of input has arrived yet.
+
+    It is an EOFError, so code that treats running out of input as 'quit' handles it too.
+    """
+
+
+class GameIO:
+    """An abstract reader/writer for the game.
+
+    Writes are buffered until flush, which emits them in one piece; read flushes
+    pending output (including the prompt) before returning the next line of input.
+    Subclasses implement _emit and _read_line.
+    """
+    # Private Instance Attributes:
+    #   - _parts: the pieces of text written since the last flush
+
+    def __init__(self) -> None:
+        """Initialize an empty output buffer."""
+        self._parts: list[str] = []
+
+    def write(self, text: str) -> None:
+        """Buffer text as is."""
+        self._parts.append(text)
+
+    def line(self, *values: object) -> None:
+        """Buffer values the way print(*values) would print them."""
+        self.write(" ".join(str(v) for v in values) + "\n")
+
+    def buffered(self) -> int:
+        """Return a position in the output buffer, for discard: how many pieces of text it holds."""
+        return len(self._parts)
+
+    def discard(self, position: int) -> None:
+        """Drop the text buffered since buffered() returned position (unless it has been flushed since)."""
+        del self._parts[position:]
+
+    def flush(self) -> None:
+        """Emit all buffered text at once and empty the buffer."""
+        if not self._parts:
+            return
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._emit(text)
+
+    def read(self, prompt: str = "") -> str:
+        """Show prompt, then return the next line of input (without its newline).
+
+        Raise EOFError if there is no more input.
+        """
+        self.write(prompt)
+        self.flush()
+        return self._read_line()
+
+    def _emit(self, text: str) -> None:
+        """Send text to wherever this backend's output goes."""
+        raise NotImplementedError
+
+    def _read_line(self) -> str:
+        """Return the next line of input, or raise EOFError."""
+        raise NotImplementedError
+
+
+class TerminalIO(GameIO):
+    """Reads from standard input and writes to a text stream (standard output by default).
+
+    Instance Attributes:
+        - stream: the stream to write to, or None to use whatever sys.stdout is at flush time
+    """
+    stream: Optional[TextIO]
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        """Initialize a terminal backend writing to stream."""
+        super().__init__()
+        self.stream = stream
+
+    def _emit(self, text: str) -> None:
+        """Write text to the stream in one call."""
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(text)
+        stream.flush()
+
+    def _read_line(self) -> str:
+        """Return the next line typed on standard input."""
+        return input()
+
+
+class ScriptedIO(GameIO):
+    """Reads lines from a script held in memory and keeps the output in memory.
+
+    Instance Attributes:
+        - keep_output: whether emitted output is kept (False discards it, e.g. for replays)
+        - output: the output emitted so far, when keep_output is True
+    """
+    keep_output: bool
+    output: list[str]
+
+    # Private Instance Attributes:
+    #   - _lines: iterator over the remaining lines of the script
+
+    def __init__(self, lines: Iterable[str], keep_output: bool = True) -> None:
+        """Initialize a backend that reads the given lines in order."""
+        super().__init__()
+        self._lines = iter(lines)
+        self.keep_output = keep_output
+        self.output = []
+
+    def _emit(self, text: str) -> None:
+        """Keep text (unless output is being discarded)."""
+        if self.keep_output:
+            self.output.append(text)
+
+    def _read_line(self) -> str:
+        """Return the next scripted line, or raise EOFError once the script is over."""
+        try:
+            return next(self._lines)
+        except StopIteration:
+            raise EOFError from None
+
+    def getvalue(self) -> str:
+        """Return all output emitted so far as one string."""
+        return "".join(self.output)
+
+
+class NonBlockingIO(GameIO):
+    """A backend for servers: neither reading nor writing ever blocks.
+
+    The server feeds lines in with feed and collects output with drain, from any thread.
+    read returns a line that has already arrived, or raises InputPending immediately,
+    so the server should only hand a session a command once has_input is True.
+    """
+    # Private Instance Attributes:
+    #   - _inbox: lines fed in but not read yet
+    #   - _outbox: output emitted but not drained yet
+    #   - _lock: protects _outbox
+
+    def __init__(self) -> None:
+        """Initialize a backend with no input and no output."""
+        super().__init__()
+        self._inbox: deque[str] = deque()
+        self._outbox: list[str] = []
+        self._lock = threading.Lock()
+
+    def feed(self, line: str) -> None:
+        """Queue a line of input for the game."""
+        self._inbox.append(line)
+
+    def has_input(self) -> bool:
+        """Return whether a line of input is waiting to be read."""
+        return bool(self._inbox)
+
+    def drain(self) -> str:
+        """Return and clear all output emitted since the last drain."""
+        with self._lock:
+            text = "".join(self._outbox)
+            self._outbox.clear()
+        return text
+
+    def _emit(self, text: str) -> None:
+        """Queue text for the next drain."""
+        with self._lock:
+            self._outbox.append(text)
+
+    def _read_line(self) -> str:
+        """Return the oldest queued line, or raise InputPending if there is none."""
+        try:
+            return self._inbox.popleft()
+        except IndexError:
+            raise InputPending from None
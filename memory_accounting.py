@@ -0,0 +1,114 @@
+"""CSC111 Project 1: Text Adventure Game - Memory Accounting
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module measures where a running game's memory goes, for sizing hosts for
+many concurrent sessions and for checking that memory-reduction work pays off.
+
+deep_sizes walks the object graphs of several subsystems (see AdventureGame.memory_report)
+and adds up sys.getsizeof of every object reached. An object reachable from several
+subsystems (e.g. a description string shared by a location and the event log) is counted
+once, in the first subsystem that reaches it. measure_bytes_per_action uses tracemalloc to
+measure how much memory a game actually keeps per command.
+
+Usage: python memory_accounting.py [commands] [seed]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+import types
+from typing import Any, Iterable
+
+# Objects that are never counted (or walked into): they are shared by the whole program
+_NOT_COUNTED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_sizes(roots: dict[str, Iterable[Any]]) -> dict[str, tuple[int, int]]:
+    """Return subsystem name -> (bytes, number of objects) for the objects reachable from each
+    subsystem's roots, counting every object once, in the first subsystem (in the order of roots)
+    that reaches it. None, booleans and classes, modules and functions are not counted.
+    """
+    seen: set[int] = set()
+    sizes = {}
+    for name, subsystem_roots in roots.items():
+        total = 0
+        count = 0
+        stack = list(subsystem_roots)
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen or obj is None or isinstance(obj, (bool, _NOT_COUNTED)):
+                continue
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+            count += 1
+            if not isinstance(obj, (str, bytes, int, float)):
+                stack.extend(gc.get_referents(obj))
+        sizes[name] = (total, count)
+    return sizes
+
+
+def measure_bytes_per_action(game: Any, commands: Iterable[str]) -> float:
+    """Run commands through game.process_choice and return the memory (as traced by tracemalloc) that
+    the game kept, per command. Memory freed along the way (e.g. evicted undo history) is netted out.
+
+    commands may be a generator that picks each command from the game's current state.
+    """
+    gc.collect()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    count = 0
+    for command in commands:
+        game.process_choice(command)
+        game.io.flush()
+        count += 1
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    if not tracing:
+        tracemalloc.stop()
+    return (after - before) / count if count else 0.0
+
+
+def format_report(report: dict[str, tuple[int, int]]) -> str:
+    """Return report (from AdventureGame.memory_report) as a table, one subsystem per line."""
+    total = sum(size for size, _ in report.values())
+    lines = [f"{name:<18} {size:>12} bytes {count:>9} objects {size / total if total else 0:>7.1%}"
+             for name, (size, count) in report.items()]
+    lines.append(f"{'total':<18} {total:>12} bytes")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import random
+
+    from adventure import AdventureGame
+    from fuzz import random_command
+    from game_io import ScriptedIO
+
+    args = [int(a) for a in sys.argv[1:]]
+    n_commands = args[0] if len(args) > 0 else 10_000
+    seed = args[1] if len(args) > 1 else 0
+
+    rng = random.Random(seed)
+    session = AdventureGame('game_data.json', 6, max_moves=10 ** 9, io=ScriptedIO([], keep_output=False))
+    script = (random_command(session, rng, 0.1, 0.1, 0.0) for _ in range(n_commands))
+    per_action = measure_bytes_per_action(session, script)
+
+    print(format_report(session.memory_report()))
+    print(f"{per_action:.1f} bytes kept per command over {n_commands} commands "
+          f"(undo history: {session.undo_stats()['entries']} actions held)")
@@ -0,0 +1,412 @@
+"""CSC111 Project 1: Text Adventure Game - Paged Region Store
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module lets a game run on a world too big to keep in memory, by paging its
+locations in from disk a region at a time.
+
+build_region_store converts a world (a game data file or shard manifest) into a region store
+directory: the locations are split into regions of nearby locations (grown breadth-first
+along the commands, so a location's neighbours are usually in its own region), and each
+region is stored as one line of JSON in regions.dat. The location graph (see world_graph)
+and the items are saved alongside and stay in memory; they are small next to the
+descriptions.
+
+A RegionStore maps location ids to Location objects like the dict AdventureGame normally
+uses, but keeps at most max_resident regions in memory, evicting the least recently used
+region when another one is paged in. An AdventureGame given a region store directory
+instead of a game data file uses one (see AdventureGame.region_stats).
+
+The state a session changes (the items at a location and whether it was visited) is never
+lost: when a region is evicted, the state of every location in it that differs from the
+disk version is kept in the store's overlay, and put back when the region is paged in again.
+
+Usage:
+    python region_store.py build <world.json> <output dir> <start id> [region size]
+    python region_store.py tune <store dir> <start id> [moves] [budget ...]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from typing import Callable, Iterable, Iterator, Optional
+
+from game_entities import Location
+from world_graph import WorldGraph
+from world_shards import read_world
+from world_validator import WorldValidationError, validate_world_data
+
+# The most locations put in one region by build_region_store
+REGION_SIZE = 256
+
+# The default number of regions a RegionStore keeps in memory
+REGION_STORE_MAX_RESIDENT = 64
+
+
+def _partition(graph: WorldGraph, ids: list[int], region_size: int) -> list[list[int]]:
+    """Return the rows of graph split into regions of at most region_size rows, each grown
+    breadth-first from its lowest unassigned row. ids[row] is the location id of row."""
+    region_of_row = [-1] * len(ids)
+    regions = []
+    for first in range(len(ids)):
+        if region_of_row[first] != -1:
+            continue
+        region = len(regions)
+        members = [first]
+        region_of_row[first] = region
+        queue = deque([first])
+        while queue and len(members) < region_size:
+            for target in graph.commands_of(ids[queue.popleft()]).values():
+                row = graph.row(target)
+                if row is not None and region_of_row[row] == -1 and len(members) < region_size:
+                    region_of_row[row] = region
+                    members.append(row)
+                    queue.append(row)
+        regions.append(members)
+    return regions
+
+
+def build_region_store(game_data_file: str, dirname: str, start_id: int, region_size: int = REGION_SIZE) -> int:
+    """Convert the world in game_data_file (a game data file or shard manifest) into a region store
+    in the directory dirname (created if needed), and return the number of regions.
+
+    Raise WorldValidationError if the world is not valid for a game starting at start_id.
+    """
+    data, _ = read_world(game_data_file)
+    problems = validate_world_data(data, start_id)
+    if problems:
+        raise WorldValidationError(game_data_file, problems)
+
+    graph = WorldGraph.from_world_data(data)
+    graph.save(dirname)
+    locations = data['locations']
+    regions = _partition(graph, [loc['id'] for loc in locations], region_size)
+
+    region_of_row = array('i', bytes(4 * len(locations)))
+    offsets = array('q', [0])
+    with open(os.path.join(dirname, "regions.dat"), 'wb') as f:
+        for region, rows in enumerate(regions):
+            for row in rows:
+                region_of_row[row] = region
+            line = (json.dumps([locations[row] for row in rows]) + "\n").encode('utf-8')
+            f.write(line)
+            offsets.append(offsets[-1] + len(line))
+    for name, values in (("region-of-row", region_of_row), ("region-offsets", offsets)):
+        with open(os.path.join(dirname, name + ".bin"), 'wb') as f:
+            values.tofile(f)
+
+    with open(os.path.join(dirname, "store.json"), 'w', encoding='utf-8') as f:
+        json.dump({
+            "start_id": start_id,
+            "region_size": region_size,
+            "regions": len(regions),
+            "locations": len(locations),
+            "items": data['items'],
+            "listed_items": [[loc['id'], loc['items']] for loc in locations if loc['items']]
+        }, f)
+    return len(regions)
+
+
+def is_region_store(path: str) -> bool:
+    """Return whether path is a region store directory (made by build_region_store)."""
+    return os.path.isfile(os.path.join(path, "store.json"))
+
+
+class _RegionIndex:
+    """The in-memory part of a region store, read once and shared by every RegionStore of it."""
+    __slots__ = ("stamp", "data_file", "graph", "region_of_row", "offsets", "items", "listed", "location_count")
+    stamp: tuple[int, int]
+    data_file: str
+    graph: WorldGraph
+    region_of_row: array
+    offsets: array
+    items: list[dict]
+    listed: dict[int, tuple[str, ...]]
+    location_count: int
+
+    def __init__(self, dirname: str, stamp: tuple[int, int]) -> None:
+        self.stamp = stamp
+        self.data_file = os.path.join(dirname, "regions.dat")
+        self.graph = WorldGraph.load(dirname)
+        with open(os.path.join(dirname, "store.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.items = meta["items"]
+        self.listed = {loc_id: tuple(names) for loc_id, names in meta["listed_items"]}
+        self.location_count = meta["locations"]
+        self.region_of_row = array('i')
+        self.offsets = array('q')
+        for name, values in (("region-of-row", self.region_of_row), ("region-offsets", self.offsets)):
+            path = os.path.join(dirname, name + ".bin")
+            with open(path, 'rb') as f:
+                values.fromfile(f, os.path.getsize(path) // values.itemsize)
+
+
+_INDEXES: dict[str, _RegionIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _open_index(dirname: str) -> _RegionIndex:
+    """Return the shared index of the region store in dirname, reading it if it is new or was rebuilt."""
+    path = os.path.abspath(dirname)
+    st = os.stat(os.path.join(path, "store.json"))
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(path)
+        if index is None or index.stamp != stamp:
+            index = _INDEXES[path] = _RegionIndex(path, stamp)
+        return index
+
+
+class RegionStore:
+    """The locations of one game's world, paged in from a region store a region at a time.
+
+    Instance Attributes:
+        - dirname: the region store directory
+        - max_resident: the most regions kept in memory
+        - hits: lookups of a location whose region was resident
+        - misses: lookups that had to page a region in
+        - prefetches: regions paged in ahead of time by prefetch
+        - evictions: regions evicted to stay within max_resident
+        - page_in_seconds: total time spent paging regions in
+
+    Representation Invariants:
+        - self.max_resident >= 2
+        - len(self._resident) <= self.max_resident
+        - no location id is both in self._overlay and in a resident region
+    """
+    dirname: str
+    max_resident: int
+    hits: int
+    misses: int
+    prefetches: int
+    evictions: int
+    page_in_seconds: float
+
+    # Private Instance Attributes:
+    #   - _index: the shared graph, region index and items of the store
+    #   - _resident: region -> (location id -> Location) of the regions in memory, least recently used first
+    #   - _overlay: location id -> (items, visited), for the locations of evicted regions whose state
+    #     differs from the disk version
+    #   - _on_evict: called with the location ids of each evicted region
+
+    def __init__(self, dirname: str, max_resident: int = REGION_STORE_MAX_RESIDENT,
+                 on_evict: Optional[Callable[[list[int]], None]] = None) -> None:
+        """Open the region store in dirname, keeping at most max_resident regions in memory.
+
+        Preconditions:
+            - max_resident >= 2
+        """
+        self.dirname = dirname
+        self.max_resident = max_resident
+        self.hits = 0
+        self.misses = 0
+        self.prefetches = 0
+        self.evictions = 0
+        self.page_in_seconds = 0.0
+        self._index = _open_index(dirname)
+        self._resident: OrderedDict[int, dict[int, Location]] = OrderedDict()
+        self._overlay: dict[int, tuple[list[str], bool]] = {}
+        self._on_evict = on_evict
+
+    @property
+    def graph(self) -> WorldGraph:
+        """The location graph of the world (shared, read-only; use WorldGraph.overlay to patch it)."""
+        return self._index.graph
+
+    def item_records(self) -> list[dict]:
+        """Return the item records of the world (shared, read-only)."""
+        return self._index.items
+
+    def __len__(self) -> int:
+        """Return the number of locations in the world."""
+        return self._index.location_count
+
+    def __contains__(self, loc_id: int) -> bool:
+        """Return whether the world has a location with id loc_id."""
+        return self._index.graph.row(loc_id) is not None
+
+    def __getitem__(self, loc_id: int) -> Location:
+        """Return the Location with id loc_id, paging its region in if needed. Raise KeyError if there
+        is no such location."""
+        row = self._index.graph.row(loc_id)
+        if row is None:
+            raise KeyError(loc_id)
+        region = self._index.region_of_row[row]
+        locations = self._resident.get(region)
+        if locations is None:
+            self.misses += 1
+            locations = self._page_in(region)
+        else:
+            self.hits += 1
+            self._resident.move_to_end(region)
+        return locations[loc_id]
+
+    def get(self, loc_id: int, default: Optional[Location] = None) -> Optional[Location]:
+        """Return the Location with id loc_id (see __getitem__), or default if there is none."""
+        return self[loc_id] if loc_id in self else default
+
+    def values(self) -> Iterator[Location]:
+        """Yield every Location, paging each region in in turn. A Location yielded earlier may have
+        been evicted since, so it is only good for reading."""
+        for region in range(len(self._index.offsets) - 1):
+            locations = self._resident.get(region)
+            if locations is None:
+                self.misses += 1
+                locations = self._page_in(region)
+            yield from list(locations.values())
+
+    def prefetch(self, loc_ids: Iterable[int]) -> None:
+        """Page in the regions of loc_ids that are not resident (at most max_resident - 1 of them, so the
+        most recently used region stays)."""
+        index = self._index
+        budget = self.max_resident - 1
+        for loc_id in loc_ids:
+            row = index.graph.row(loc_id)
+            if row is None or index.region_of_row[row] in self._resident:
+                continue
+            if budget == 0:
+                return
+            budget -= 1
+            self.prefetches += 1
+            self._page_in(index.region_of_row[row])
+
+    def states(self) -> Iterator[tuple[int, list[str], bool]]:
+        """Yield (location id, items, visited) for every location that has items or was visited, and
+        every location whose state differs from the disk version. Every other location is empty and
+        unvisited. Nothing is paged in."""
+        listed = self._index.listed
+        for locations in self._resident.values():
+            for loc_id, loc in locations.items():
+                if loc.items or loc.visited or loc_id in listed:
+                    yield loc_id, loc.items, loc.visited
+        for loc_id, (items, visited) in self._overlay.items():
+            yield loc_id, items, visited
+        for loc_id, names in listed.items():
+            if loc_id not in self._overlay and not self._is_resident(loc_id):
+                yield loc_id, list(names), False
+
+    def set_state(self, loc_id: int, items: list[str], visited: bool) -> None:
+        """Set the items and visited flag of loc_id, without paging it in."""
+        row = self._index.graph.row(loc_id)
+        locations = self._resident.get(self._index.region_of_row[row])
+        if locations is not None:
+            locations[loc_id].items = list(items)
+            locations[loc_id].visited = visited
+        elif visited or list(items) != list(self._index.listed.get(loc_id, ())):
+            self._overlay[loc_id] = (list(items), visited)
+        else:
+            self._overlay.pop(loc_id, None)
+
+    def reset(self) -> None:
+        """Put every location back in its disk state (its items from the world file, not visited)."""
+        self._overlay.clear()
+        listed = self._index.listed
+        for locations in self._resident.values():
+            for loc_id, loc in locations.items():
+                loc.items = list(listed.get(loc_id, ()))
+                loc.visited = False
+
+    def stats(self) -> dict[str, int]:
+        """Return the store's residency and paging counters."""
+        return {
+            'regions': len(self._index.offsets) - 1,
+            'resident_regions': len(self._resident),
+            'resident_locations': sum(len(locations) for locations in self._resident.values()),
+            'max_resident': self.max_resident,
+            'hits': self.hits,
+            'misses': self.misses,
+            'prefetches': self.prefetches,
+            'evictions': self.evictions,
+            'overlay': len(self._overlay),
+            'page_in_us': round(self.page_in_seconds * 1_000_000)
+        }
+
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups served without paging in (1.0 before any lookup)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 1.0
+
+    def _is_resident(self, loc_id: int) -> bool:
+        """Return whether the region of loc_id is in memory."""
+        return self._index.region_of_row[self._index.graph.row(loc_id)] in self._resident
+
+    def _page_in(self, region: int) -> dict[int, Location]:
+        """Read region from disk, make it the most recently used and evict regions over max_resident."""
+        start_time = time.perf_counter()
+        start, stop = self._index.offsets[region], self._index.offsets[region + 1]
+        with open(self._index.data_file, 'rb') as f:
+            f.seek(start)
+            records = json.loads(f.read(stop - start))
+
+        locations = {}
+        for record in records:
+            loc = Location(record['id'], record['brief_description'], record['long_description'],
+                           record['available_commands'], list(record['items']))
+            if loc.id_num in self._overlay:
+                loc.items, loc.visited = self._overlay.pop(loc.id_num)
+            locations[loc.id_num] = loc
+        self._resident[region] = locations
+
+        while len(self._resident) > self.max_resident:
+            self._evict()
+        self.page_in_seconds += time.perf_counter() - start_time
+        return locations
+
+    def _evict(self) -> None:
+        """Evict the least recently used region, keeping the changed state of its locations in the overlay."""
+        _, locations = self._resident.popitem(last=False)
+        listed = self._index.listed
+        for loc_id, loc in locations.items():
+            if loc.visited or loc.items != list(listed.get(loc_id, ())):
+                self._overlay[loc_id] = (loc.items, loc.visited)
+        self.evictions += 1
+        if self._on_evict is not None:
+            self._on_evict(list(locations))
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1] == "build":
+        start_time = time.perf_counter()
+        size = int(sys.argv[5]) if len(sys.argv) > 5 else REGION_SIZE
+        count = build_region_store(sys.argv[2], sys.argv[3], int(sys.argv[4]), size)
+        print(f"Wrote {count} regions to {sys.argv[3]} in {time.perf_counter() - start_time:.2f}s")
+    else:
+        import random
+
+        from adventure import AdventureGame
+        from game_io import ScriptedIO
+
+        # Play the same seeded random walk with each budget, to trade memory for page-in time
+        moves = int(sys.argv[4]) if len(sys.argv) > 4 else 10_000
+        for budget in [int(a) for a in sys.argv[5:]] or [2, 8, 32, 128]:
+            rng = random.Random(0)
+            game = AdventureGame(sys.argv[2], int(sys.argv[3]), max_moves=10 ** 9, max_resident_regions=budget,
+                                 io=ScriptedIO([], keep_output=False))
+            start_time = time.perf_counter()
+            for _ in range(moves):
+                game.process_choice(rng.choice(sorted(game.available_commands())))
+                game.io.flush()
+            counters = game.region_stats()
+            lookups = counters['hits'] + counters['misses']
+            print(f"budget {budget:>5} regions: {time.perf_counter() - start_time:.2f}s, "
+                  f"hit rate {counters['hits'] / lookups:.2%}, {counters['misses']} misses, "
+                  f"{counters['prefetches']} prefetches, {counters['page_in_us'] / 1000:.1f} ms paging in, "
+                  f"{counters['resident_locations']} locations resident")
@@ -0,0 +1,234 @@
+"""CSC111 Project 1: Text Adventure Game - Session Replay
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module records play sessions of the adventure game and replays them
+deterministically (with rendering turned off). A recording is the stream of lines the
+player typed plus the RNG seeds of any Evolution Arena matches they played, together
+with the final event log ids and score, so a replay can be checked against it.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, asdict
+from multiprocessing import Pool
+from typing import Optional
+
+from adventure import AdventureGame, is_menu_choice
+from game_io import GameIO, ScriptedIO
+
+
+@dataclass
+class SessionRecording:
+    """A recorded play session.
+
+    Instance Attributes:
+        - game_data_file: the world file the session was played on
+        - initial_location_id: the starting location id
+        - max_moves: the move limit of the session
+        - inputs: every line the player typed, in order (main menu and arena prompts alike)
+        - arena_seeds: the RNG seed of each arena match, in the order the matches were played
+        - id_log: the event log location ids at the end of the session
+        - score: the score at the end of the session
+        - arena_ai_strategy: the CSSU AI the arena used (see adventure.ARENA_AI_STRATEGIES)
+
+    Representation Invariants:
+        - self.max_moves > 0
+    """
+    game_data_file: str
+    initial_location_id: int
+    max_moves: int
+    inputs: list[str]
+    arena_seeds: list[int]
+    id_log: list[int]
+    score: int
+    arena_ai_strategy: str = "classic"
+
+    def save(self, filename: str) -> None:
+        """Write this recording to filename as a single JSON object."""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f)
+
+    @staticmethod
+    def load(filename: str) -> SessionRecording:
+        """Return the recording stored in filename by save."""
+        with open(filename, 'r', encoding='utf-8') as f:
+            return SessionRecording(**json.load(f))
+
+
+class SessionRecorder(GameIO):
+    """Records every line read by a running AdventureGame.
+
+    The recorder installs itself as game.io and passes everything through to the
+    backend it replaced, so the main loop and the arena prompts are recorded in the
+    exact order they consumed their input.
+
+    Instance Attributes:
+        - inputs: the lines read so far
+    """
+    # Private Instance Attributes:
+    #   - _game: the game being recorded
+    #   - _inner: the backend that was installed on the game before recording started
+    #   - _game_data_file, _initial_location_id: how the game was created
+    _game: AdventureGame
+    _inner: GameIO
+    _game_data_file: str
+    _initial_location_id: int
+    inputs: list[str]
+
+    def __init__(self, game: AdventureGame, game_data_file: str, initial_location_id: int) -> None:
+        """Start recording the given (freshly created) game."""
+        super().__init__()
+        self._game = game
+        self._game_data_file = game_data_file
+        self._initial_location_id = initial_location_id
+        self._inner = game.io
+        self.inputs = []
+        game.io = self
+
+    def write(self, text: str) -> None:
+        """Pass text on to the wrapped backend."""
+        self._inner.write(text)
+
+    def buffered(self) -> int:
+        """Return a position in the wrapped backend's output buffer."""
+        return self._inner.buffered()
+
+    def discard(self, position: int) -> None:
+        """Drop the text the wrapped backend buffered since position."""
+        self._inner.discard(position)
+
+    def flush(self) -> None:
+        """Flush the wrapped backend."""
+        self._inner.flush()
+
+    def read(self, prompt: str = "") -> str:
+        """Read a line through the wrapped backend and remember it."""
+        line = self._inner.read(prompt)
+        self.inputs.append(line)
+        return line
+
+    def finish(self) -> SessionRecording:
+        """Stop recording and return the session recorded so far."""
+        self._game.io = self._inner
+        return SessionRecording(
+            game_data_file=self._game_data_file,
+            initial_location_id=self._initial_location_id,
+            max_moves=self._game.max_moves,
+            inputs=list(self.inputs),
+            arena_seeds=list(self._game.arena_seeds),
+            id_log=self._game.event_log.get_id_log(),
+            score=self._game.score,
+            arena_ai_strategy=self._game.arena_ai_strategy
+        )
+
+
+def replay_session(recording: SessionRecording, steps: Optional[int] = None) -> AdventureGame:
+    """Replay the recording with rendering off and return the resulting game.
+
+    If steps is given, fast-forward only through the first <steps> main-menu commands: lines the
+    main loop rejects without running anything (see is_menu_choice) are not commands, and lines
+    consumed by arena prompts inside a command belong to that command.
+    """
+    script = ScriptedIO(recording.inputs, keep_output=False)
+    game = AdventureGame(recording.game_data_file, recording.initial_location_id, recording.max_moves, io=script)
+    game.arena_ai_strategy = recording.arena_ai_strategy
+    game.queue_arena_seeds(recording.arena_seeds)
+
+    step = 0
+    while game.ongoing and (steps is None or step < steps):
+        in_arena = game.arena_prompt() is not None
+        try:
+            line = script.read()
+        except EOFError:
+            break
+        if not in_arena and not is_menu_choice(line):
+            continue  # the main loop asked again without running a command
+        game.process_choice(line)
+        if game.arena_prompt() is None:  # the command (and any arena it started) is over
+            step += 1
+    script.flush()
+
+    return game
+
+
+def verify_session(recording: SessionRecording) -> list[str]:
+    """Replay the whole recording and return a list of mismatches (empty if it replays exactly).
+
+    A session recorded by the main loop of adventure.py (which also describes the location at the
+    start and after every undo, redo and restart):
+    >>> recording = SessionRecording('game_data.json', 6, 30, ["go east", "undo", "look", "undo", "redo",
+    ...                              "score", "quit"], [], [6, 1], 0)
+    >>> verify_session(recording)
+    []
+    """
+    game = replay_session(recording)
+    problems = []
+
+    id_log = game.event_log.get_id_log()
+    if id_log != recording.id_log:
+        problems.append(f"id log differs: recorded {recording.id_log}, replayed {id_log}")
+    if game.score != recording.score:
+        problems.append(f"score differs: recorded {recording.score}, replayed {game.score}")
+
+    return problems
+
+
+def verify_sessions(recordings: list[SessionRecording], processes: Optional[int] = None,
+                    chunksize: int = 64) -> list[list[str]]:
+    """Verify many recordings across a pool of worker processes.
+
+    Return the list of mismatches of each recording, in the same order as recordings.
+    processes=1 verifies in this process (no pool).
+    """
+    if processes == 1:
+        return [verify_session(rec) for rec in recordings]
+
+    with Pool(processes) as pool:
+        return pool.map(verify_session, recordings, chunksize=chunksize)
+
+
+def load_recordings(filename: str) -> list[SessionRecording]:
+    """Return the recordings in a JSON-lines file (one SessionRecording object per line)."""
+    recordings = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                recordings.append(SessionRecording(**json.loads(line)))
+    return recordings
+
+
+def save_recordings(recordings: list[SessionRecording], filename: str) -> None:
+    """Write recordings to a JSON-lines file readable by load_recordings."""
+    with open(filename, 'w', encoding='utf-8') as f:
+        for rec in recordings:
+            f.write(json.dumps(asdict(rec)) + "\n")
+
+
+if __name__ == "__main__":
+    # Usage: python replay.py recordings.jsonl  (or a single recording saved by "adventure.py --record")
+    import sys
+
+    path = sys.argv[1]
+    if path.endswith(".jsonl"):
+        all_recordings = load_recordings(path)
+    else:
+        all_recordings = [SessionRecording.load(path)]
+
+    results = verify_sessions(all_recordings)
+    failures = [(i, res) for i, res in enumerate(results) if res]
+    for i, res in failures:
+        print(f"session {i}: " + "; ".join(res))
+    print(f"{len(all_recordings) - len(failures)}/{len(all_recordings)} sessions replayed exactly.")
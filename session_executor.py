@@ -0,0 +1,314 @@
+"""CSC111 Project 1: Text Adventure Game - Threaded Session Executor
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module runs the commands of many game sessions on a shared thread pool.
+AdventureGame and EventList are not thread-safe, so every session has its own lock and
+its own queue of pending commands: a session's commands run one at a time, in the order
+they were submitted, while different sessions run concurrently. No thread ever waits on
+another session's lock, because a session is only scheduled on the pool when it has
+queued commands and is not already running.
+
+The world data shared between sessions (the parsed file in world_cache.WORLD_CACHE) is
+only ever read, so sessions read it without locking; each session has its own Location
+and Item objects for its mutable state.
+
+Run this module to stress test the executor: many sessions get seeded random command
+streams from several submitting threads, and the final state of every session is
+checked against running the same commands sequentially.
+
+Usage: python session_executor.py [sessions] [commands per session] [workers]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from adventure import AdventureGame
+from game_io import NonBlockingIO
+
+
+class _Session:
+    """One game run by a SessionExecutor, with its lock and its queue of (command, future) pairs.
+    idle is notified (under lock) whenever the session stops being scheduled."""
+    __slots__ = ("game", "lock", "idle", "pending", "scheduled", "closed", "commands_run")
+    game: AdventureGame
+    lock: threading.Lock
+    idle: threading.Condition
+    pending: deque[tuple[str, Future]]
+    scheduled: bool
+    closed: bool
+    commands_run: int
+
+    def __init__(self, game: AdventureGame) -> None:
+        self.game = game
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.pending = deque()
+        self.scheduled = False
+        self.closed = False
+        self.commands_run = 0
+
+
+class SessionExecutor:
+    """Runs the commands of many AdventureGame sessions on a thread pool, one command at a time per session.
+
+    Instance Attributes:
+        - max_workers: the number of pool threads
+    """
+    max_workers: Optional[int]
+
+    # Private Instance Attributes:
+    #   - _pool: the thread pool running sessions
+    #   - _sessions: session id -> session
+    #   - _ids: source of new session ids
+    #   - _sessions_lock: protects _sessions when sessions are added or removed
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """Initialize an executor with no sessions, running on max_workers threads (None: the
+        ThreadPoolExecutor default)."""
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="session")
+        self._sessions: dict[int, _Session] = {}
+        self._ids = itertools.count(1)
+        self._sessions_lock = threading.Lock()
+
+    def open_session(self, game_data_file: str, initial_location_id: int, **game_options: object) -> int:
+        """Start a new game (with a NonBlockingIO, unless game_options gives an io) and return its session id.
+        game_options are passed on to AdventureGame."""
+        game_options.setdefault("io", NonBlockingIO())
+        return self.add_session(AdventureGame(game_data_file, initial_location_id, **game_options))
+
+    def add_session(self, game: AdventureGame) -> int:
+        """Run game as a new session and return its session id. game must not be used directly afterwards."""
+        session_id = next(self._ids)
+        with self._sessions_lock:
+            self._sessions[session_id] = _Session(game)
+        return session_id
+
+    def close_session(self, session_id: int) -> AdventureGame:
+        """Stop accepting commands for session_id, wait until its queued commands have run, and return
+        its game (which no pool thread uses any more)."""
+        with self._sessions_lock:
+            session = self._sessions.pop(session_id)
+        with session.lock:
+            session.closed = True
+            while session.scheduled:
+                session.idle.wait()
+            return session.game
+
+    def session_ids(self) -> list[int]:
+        """Return the ids of the open sessions."""
+        with self._sessions_lock:
+            return list(self._sessions)
+
+    def submit(self, session_id: int, command: str) -> Future:
+        """Queue command for session_id and return a future for process_choice's result.
+
+        Commands submitted to the same session run in submission order, never concurrently.
+        Raise KeyError if the session is closed. After shutdown, the future fails with RuntimeError.
+        """
+        session = self._sessions[session_id]
+        future: Future = Future()
+        with session.lock:
+            if session.closed:
+                raise KeyError(session_id)
+            session.pending.append((command, future))
+            if session.scheduled:
+                return future
+            session.scheduled = True
+        try:
+            self._pool.submit(self._drain, session)
+        except RuntimeError as e:  # the pool has been shut down: nothing will run the queue
+            with session.lock:
+                failed = list(session.pending)
+                session.pending.clear()
+                session.scheduled = False
+                session.idle.notify_all()
+            for _, queued in failed:
+                if queued.set_running_or_notify_cancel():
+                    queued.set_exception(e)
+        return future
+
+    def run(self, session_id: int, command: str) -> str:
+        """Run command for session_id (after its queued commands) and return the result."""
+        return self.submit(session_id, command).result()
+
+    def query(self, session_id: int, what: str) -> object:
+        """Return the attribute named what (e.g. "score") of session_id's game, read between commands."""
+        session = self._sessions[session_id]
+        with session.lock:
+            return getattr(session.game, what)
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of open sessions, of commands run and of commands still queued."""
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+        return {
+            'sessions': len(sessions),
+            'commands_run': sum(s.commands_run for s in sessions),
+            'queued': sum(len(s.pending) for s in sessions)
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting commands; if wait, first let every queued command run."""
+        self._pool.shutdown(wait=wait)
+
+    def _drain(self, session: _Session) -> None:
+        """Run session's queued commands in order until its queue is empty (on a pool thread)."""
+        while True:
+            with session.lock:
+                if not session.pending:
+                    session.scheduled = False
+                    session.idle.notify_all()
+                    return
+                command, future = session.pending.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                result = error = None
+                try:
+                    result = session.game.process_choice(command)
+                    session.game.io.flush()
+                except Exception as e:  # the caller sees the error through the future
+                    error = e
+                session.commands_run += 1
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+# -------------------------
+# Stress test
+# -------------------------
+# Commands mixed into the stress test's random streams, besides every move, take and drop of the world
+# (the arena moves and "try again" play the Bahen arena when a session is in it)
+STRESS_EXTRA_COMMANDS: tuple[str, ...] = ("look", "inventory", "score", "undo", "redo", "dance",
+                                          "rock 2", "paper 3", "scissors 1", "shadow 1", "try again")
+
+
+def _stress_vocabulary(game: AdventureGame) -> list[str]:
+    """Return the commands the stress test picks from for game's world."""
+    commands = sorted({command for loc in game.get_all_locations() for command in game.available_commands(loc.id_num)})
+    for item in game.get_all_items():
+        commands += ["take " + item.name, "drop " + item.name]
+    return commands + list(STRESS_EXTRA_COMMANDS)
+
+
+@dataclass
+class StressReport:
+    """The result of a stress test.
+
+    Instance Attributes:
+        - sessions: the number of sessions run
+        - commands: the number of commands run
+        - elapsed: wall-clock seconds for the concurrent run
+        - sequential_elapsed: wall-clock seconds to run the same commands one session after another
+        - mismatches: the ids of sessions whose final state differs from the sequential run
+    """
+    sessions: int
+    commands: int
+    elapsed: float
+    sequential_elapsed: float
+    mismatches: list[int] = field(default_factory=list)
+
+    def commands_per_sec(self) -> float:
+        """Return the throughput of the concurrent run."""
+        return self.commands / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _final_state(game: AdventureGame) -> tuple:
+    """Return what the stress test compares: the event log, score, moves, inventory and state hash."""
+    return (game.event_log.to_list(), game.score, game.moves_used,
+            game.show_inventory(), game.state_hash())
+
+
+def stress_test(n_sessions: int = 200, commands_per_session: int = 500, workers: int = 8,
+                submitters: int = 4, seed: int = 0, game_data_file: str = 'game_data.json',
+                initial_location_id: int = 6) -> StressReport:
+    """Run seeded random command streams for n_sessions sessions through a SessionExecutor with
+    <workers> threads, submitted from <submitters> threads (each session's commands come from one
+    submitter, interleaved with other sessions'), and compare every session's final event log and
+    state with a sequential run of the same commands. Each session gets its own arena seeds, so its
+    arena matches play out the same in both runs.
+    """
+    options = {"max_moves": 10 ** 9}
+    vocabulary = _stress_vocabulary(AdventureGame(game_data_file, initial_location_id, io=NonBlockingIO()))
+    rng = random.Random(seed)
+    scripts = [[rng.choice(vocabulary) for _ in range(commands_per_session)] for _ in range(n_sessions)]
+    # At most one match starts per take or "try again"
+    arena_seeds = [[rng.randrange(2 ** 32) for _ in range(sum(c.startswith(("take ", "try again")) for c in script))]
+                   for script in scripts]
+
+    def new_game(k: int) -> AdventureGame:
+        """Return a fresh game for session k."""
+        game = AdventureGame(game_data_file, initial_location_id, io=NonBlockingIO(), **options)
+        game.queue_arena_seeds(arena_seeds[k])
+        return game
+
+    start = time.perf_counter()
+    expected = []
+    for k, script in enumerate(scripts):
+        game = new_game(k)
+        for command in script:
+            game.process_choice(command)
+        expected.append(_final_state(game))
+    sequential_elapsed = time.perf_counter() - start
+
+    executor = SessionExecutor(workers)
+    ids = [executor.add_session(new_game(k)) for k in range(n_sessions)]
+
+    def submit_all(owned: list[int]) -> None:
+        """Submit the scripts of the sessions numbered owned, one command per session in turn."""
+        for step in range(commands_per_session):
+            for k in owned:
+                executor.submit(ids[k], scripts[k][step])
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=submit_all, args=(list(range(t, n_sessions, submitters)),))
+               for t in range(submitters)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    executor.shutdown(wait=True)
+    elapsed = time.perf_counter() - start
+
+    report = StressReport(n_sessions, n_sessions * commands_per_session, elapsed, sequential_elapsed)
+    for k, session_id in enumerate(ids):
+        if _final_state(executor.close_session(session_id)) != expected[k]:
+            report.mismatches.append(k)
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [int(a) for a in sys.argv[1:]]
+    n = args[0] if len(args) > 0 else 200
+    per_session = args[1] if len(args) > 1 else 500
+    n_workers = args[2] if len(args) > 2 else 8
+
+    result = stress_test(n, per_session, n_workers)
+    print(f"{result.commands} commands over {result.sessions} sessions on {n_workers} threads: "
+          f"{result.elapsed:.2f}s ({result.commands_per_sec():.0f} cmd/s); "
+          f"sequential: {result.sequential_elapsed:.2f}s")
+    print(f"{len(result.mismatches)} sessions differ from the sequential run (lost, duplicated or reordered events)")
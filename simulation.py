@@ -21,11 +21,13 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2026 CSC111 Teaching Team
 """
 from __future__ import annotations
-import json
+import multiprocessing
 from dataclasses import dataclass
 from typing import Optional
 
 from event_logger import Event, EventList
+from world_cache import WORLD_CACHE, load_world
+from world_graph import WorldGraph
 
 
 # Note: We have completed the Location class for you. Do NOT modify it here for A1.
@@ -54,8 +56,10 @@ class SimpleAdventureGame:
     """
     # Private Instance Attributes:
     #   - _locations: a mapping from location id to Location object. This represents all the locations in the game.
+    #   - _graph: the location graph of the world, in compressed form
     current_location_id: int
     _locations: dict[int, Location]
+    _graph: WorldGraph
 
     def __init__(self, game_data_file: str, initial_location_id: int) -> None:
         """
@@ -68,6 +72,7 @@ class SimpleAdventureGame:
 
         self._locations = self._load_game_data(game_data_file)
         self.current_location_id = initial_location_id  # game begins at this location
+        self._graph = WORLD_CACHE.graph(game_data_file)  # which command leads where (shared, read-only)
 
     @staticmethod
     def _load_game_data(filename: str) -> dict[int, Location]:
@@ -77,8 +82,7 @@ class SimpleAdventureGame:
         """
         # Note: We have completed this method for you. Do NOT modify it here for A1.
 
-        with open(filename, 'r') as f:
-            data = json.load(f)  # This loads all the data from the JSON file
+        data = load_world(filename)  # The parsed JSON file, shared through the process-wide world cache
 
         locations = {}
         for loc_data in data['locations']:  # Go through each element associated with the 'locations' key in the file
@@ -97,6 +101,17 @@ class SimpleAdventureGame:
         else:
             return self._locations[loc_id]
 
+    def next_location_id(self, loc_id: int, command: str) -> int:
+        """Return the id of the location command leads to from the location with id loc_id.
+
+        Preconditions:
+        - command is an available command at the location with id loc_id
+        """
+        next_id = self._graph.target(loc_id, command)
+        if next_id is None:
+            raise KeyError(command)
+        return next_id
+
 
 class AdventureGameSimulation:
     """A simulation of an adventure game playthrough.
@@ -134,10 +149,10 @@ class AdventureGameSimulation:
         - len(commands) > 0
         - all commands in the given list are valid commands when starting from current_location
         """
-        # Hint: current_location.available_commands[command] will return the next location ID resulting from executing
-        # <command> while in <current_location_id>
+        # self._game.next_location_id(loc_id, command) returns the next location ID resulting from executing
+        # <command> while in <loc_id> (from the world's compressed location graph)
         for command in commands:
-            next_loc_id = current_location.available_commands[command]
+            next_loc_id = self._game.next_location_id(current_location.id_num, command)
             next_loc = self._game.get_location(next_loc_id)
             new_event = Event(next_loc.id_num, next_loc.description)
             self._events.add_event(new_event, command)
@@ -177,6 +192,224 @@ class AdventureGameSimulation:
             current_event = current_event.next
 
 
+# The default number of trie nodes a SimulationMemo keeps
+SIMULATION_MEMO_MAX_NODES = 100_000
+
+
+class _MemoNode:
+    """A command prefix in a SimulationMemo. Its id log is log[:length]; the list is shared with the
+    node's descendants, and extended in place while only one branch has grown it."""
+    __slots__ = ("children", "log", "length", "tick")
+    children: dict[str, _MemoNode]
+    log: list[int]
+    length: int
+    tick: int
+
+    def __init__(self, log: list[int], length: int, tick: int) -> None:
+        self.children = {}
+        self.log = log
+        self.length = length
+        self.tick = tick
+
+
+class SimulationMemo:
+    """A bounded trie of the command prefixes simulated so far, with the id log each one reaches, so
+    that command lists sharing a prefix only simulate it once.
+
+    Instance Attributes:
+        - max_nodes: the most prefixes kept; when full, the least recently used half is pruned
+        - lookups: how many command lists were simulated through the memo
+        - steps_saved: commands that were not simulated, because their prefix was cached
+        - steps_simulated: commands that were simulated
+        - pruned: prefixes removed to stay within max_nodes
+
+    Representation Invariants:
+        - self.max_nodes >= 1
+        - a node's tick is at most its parent's (a lookup touches every node on its path)
+    """
+    max_nodes: int
+    lookups: int
+    steps_saved: int
+    steps_simulated: int
+    pruned: int
+
+    # Private Instance Attributes:
+    #   - _roots: initial location id -> the node of the empty prefix
+    #   - _nodes: the number of nodes in the trie
+    #   - _tick: the number of the latest lookup (nodes remember the last lookup that used them)
+
+    def __init__(self, max_nodes: int = SIMULATION_MEMO_MAX_NODES) -> None:
+        """Initialize an empty memo keeping at most max_nodes prefixes."""
+        self.max_nodes = max_nodes
+        self.lookups = 0
+        self.steps_saved = 0
+        self.steps_simulated = 0
+        self.pruned = 0
+        self._roots: dict[int, _MemoNode] = {}
+        self._nodes = 0
+        self._tick = 0
+
+    def __len__(self) -> int:
+        """Return the number of prefixes (trie nodes) kept."""
+        return self._nodes
+
+    def id_log(self, game: SimpleAdventureGame, initial_location_id: int, commands: list[str]) -> list[int]:
+        """Return the id log of a simulation of commands from initial_location_id in game's world,
+        resuming from the longest cached prefix of commands and caching the prefixes simulated.
+
+        Preconditions:
+        - every call uses a game of the same world
+        - all commands in the given list are valid commands when starting from the location at initial_location_id
+        """
+        if self._nodes >= self.max_nodes:
+            self._prune()
+        self.lookups += 1
+        self._tick += 1
+        tick = self._tick
+
+        node = self._roots.get(initial_location_id)
+        if node is None:
+            node = _MemoNode([game.get_location(initial_location_id).id_num], 1, tick)
+            self._roots[initial_location_id] = node
+            self._nodes += 1
+        node.tick = tick
+        depth = 0
+        for command in commands:
+            child = node.children.get(command)
+            if child is None:
+                break
+            child.tick = tick
+            node = child
+            depth += 1
+        self.steps_saved += depth
+        self.steps_simulated += len(commands) - depth
+
+        log, length = node.log, node.length
+        for command in commands[depth:]:
+            loc_id = game.next_location_id(log[length - 1], command)
+            if len(log) != length:  # another branch already extends this list
+                log = log[:length]
+            log.append(loc_id)
+            length += 1
+            if self._nodes < self.max_nodes:
+                child = _MemoNode(log, length, tick)
+                node.children[command] = child
+                node = child
+                self._nodes += 1
+        return log[:length]
+
+    def saved_fraction(self) -> float:
+        """Return the fraction of all commands looked up that did not need simulating."""
+        total = self.steps_saved + self.steps_simulated
+        return self.steps_saved / total if total else 0.0
+
+    def stats(self) -> dict[str, int]:
+        """Return the memo's size and counters."""
+        return {
+            'nodes': self._nodes,
+            'lookups': self.lookups,
+            'steps_saved': self.steps_saved,
+            'steps_simulated': self.steps_simulated,
+            'pruned': self.pruned
+        }
+
+    def _prune(self) -> None:
+        """Remove the least recently used half (at least) of the prefixes. Since a node is never used more
+        recently than its parent, this removes whole subtrees."""
+        ticks = []
+        stack = list(self._roots.values())
+        while stack:
+            node = stack.pop()
+            ticks.append(node.tick)
+            stack.extend(node.children.values())
+        ticks.sort()
+        threshold = ticks[len(ticks) // 2]
+
+        self._roots = {start: root for start, root in self._roots.items() if root.tick > threshold}
+        kept = 0
+        stack = list(self._roots.values())
+        while stack:
+            node = stack.pop()
+            kept += 1
+            node.children = {command: child for command, child in node.children.items() if child.tick > threshold}
+            stack.extend(node.children.values())
+        self.pruned += self._nodes - kept
+        self._nodes = kept
+
+
+# The world used by simulate_batch workers. It is set before the worker pool is forked,
+# so every worker shares the parent's parsed world copy-on-write instead of re-parsing it.
+_BATCH_GAME: Optional[SimpleAdventureGame] = None
+
+
+def _simulate_id_log(game: SimpleAdventureGame, initial_location_id: int, commands: list[str]) -> list[int]:
+    """Return the same list as AdventureGameSimulation(..., initial_location_id, commands).get_id_log(),
+    using the already-loaded game world and without building an event list.
+
+    Preconditions:
+    - all commands in the given list are valid commands when starting from the location at initial_location_id
+    """
+    loc_id = game.get_location(initial_location_id).id_num
+    id_log = [loc_id]
+    for command in commands:
+        loc_id = game.next_location_id(loc_id, command)
+        id_log.append(loc_id)
+    return id_log
+
+
+def _init_batch_worker(game_data_file: str, initial_location_id: int) -> None:
+    """Load the batch world in a worker process, unless it was inherited from the parent by fork."""
+    global _BATCH_GAME
+    if _BATCH_GAME is None:
+        _BATCH_GAME = SimpleAdventureGame(game_data_file, initial_location_id)
+
+
+def _simulate_batch_job(job: tuple[int, list[str]]) -> list[int]:
+    """Simulate one (initial_location_id, commands) job against the worker's batch world."""
+    return _simulate_id_log(_BATCH_GAME, job[0], job[1])
+
+
+def simulate_batch(game_data_file: str, initial_location_id: int, command_lists: list[list[str]],
+                   processes: Optional[int] = 1, chunksize: int = 256,
+                   memo: Optional[SimulationMemo] = None) -> list[list[int]]:
+    """Return the id log of a simulation of each command list, loading the world only once.
+
+    With processes=1 everything runs in this process, and if memo is given, lists resume from the
+    longest prefix it has cached (memo must only ever be used with this world). Otherwise the lists
+    are spread over a pool of <processes> worker processes (None means one per CPU), without a memo;
+    where the platform supports fork, workers share the parsed world copy-on-write.
+
+    >>> simulate_batch('sample_locations.json', 1, [["go east"], ["go east", "go east", "buy coffee"]])
+    [[1, 2], [1, 2, 3, 3]]
+    >>> memo = SimulationMemo()
+    >>> simulate_batch('sample_locations.json', 1, [["go east", "go east"], ["go east", "go east", "buy coffee"]],
+    ...                memo=memo)
+    [[1, 2, 3], [1, 2, 3, 3]]
+    >>> memo.stats()
+    {'nodes': 4, 'lookups': 2, 'steps_saved': 2, 'steps_simulated': 3, 'pruned': 0}
+
+    Preconditions:
+    - every command list is valid when starting from the location at initial_location_id
+    """
+    global _BATCH_GAME
+    game = SimpleAdventureGame(game_data_file, initial_location_id)
+    if processes == 1:
+        if memo is not None:
+            return [memo.id_log(game, initial_location_id, commands) for commands in command_lists]
+        return [_simulate_id_log(game, initial_location_id, commands) for commands in command_lists]
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    _BATCH_GAME = game if 'fork' in methods else None
+    try:
+        with context.Pool(processes, initializer=_init_batch_worker,
+                          initargs=(game_data_file, initial_location_id)) as pool:
+            jobs = [(initial_location_id, commands) for commands in command_lists]
+            return pool.map(_simulate_batch_job, jobs, chunksize)
+    finally:
+        _BATCH_GAME = None
+
+
 if __name__ == "__main__":
     # pass
     # When you are ready to check your work with python_ta, uncomment the following lines.
@@ -185,7 +418,7 @@ if __name__ == "__main__":
     import python_ta
     python_ta.check_all(config={
         'max-line-length': 120,
-        'extra-imports': ['json', 'event_logger'],
+        'extra-imports': ['multiprocessing', 'event_logger', 'world_cache', 'world_graph'],
         'allowed-io': ['AdventureGameSimulation.run', 'SimpleAdventureGame._load_game_data'],
         'disable': ['R1705', 'static_type_checker']
     })
\ No newline at end of file
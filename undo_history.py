@@ -0,0 +1,308 @@
+"""CSC111 Project 1: Text Adventure Game - Undo Tree
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the undo history used by AdventureGame. The history is a
+tree: every action is a node storing only the changes ("ops") that action made, and the
+game's current state is a cursor into the tree. Undo moves the cursor to the parent,
+redo moves it to a child, and jumping to another branch moves it through the nearest
+common ancestor. Changes made before a branch point are stored once and shared by every
+branch below it.
+
+A node's state never changes once the cursor has left it (or it was marked): an action's
+change made there afterwards starts a new node of its own, so redoing or jumping back to a
+node always reproduces the state it had. A change that is not an action by itself (e.g.
+marking a location visited) never starts a node: it is added to the cursor's node, so undo
+and redo only ever step over the player's actions.
+
+The tree has a hard budget (in nodes and approximate bytes); once over budget the
+oldest history (the root end, and branches the cursor is not on) is evicted.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import sys
+from typing import Optional
+
+
+def op_size(op: tuple) -> int:
+    """Return the approximate bytes held by op: the tuple itself plus the strings in it (descriptions,
+    commands, item names). Other objects an op refers to, like Items, belong to the game and aren't counted."""
+    return sys.getsizeof(op) + sum(sys.getsizeof(x) for x in op if isinstance(x, str))
+
+
+class UndoNode:
+    """One action in an UndoTree.
+
+    Instance Attributes:
+        - parent: the node this action was taken from, or None for the root
+        - children: the actions taken from this node, oldest first
+        - ops: the changes this action made, in the order they were made (empty for the root)
+        - label: a short description of the action (e.g. the command)
+        - depth: the number of actions between the root and this node
+        - size: the approximate bytes held by ops
+    """
+    __slots__ = ("parent", "children", "ops", "label", "depth", "size")
+    parent: Optional[UndoNode]
+    children: list[UndoNode]
+    ops: list[tuple]
+    label: str
+    depth: int
+    size: int
+
+    def __init__(self, parent: Optional[UndoNode], label: str = "") -> None:
+        """Initialize a node with no ops and no children below parent."""
+        self.parent = parent
+        self.children = []
+        self.ops = []
+        self.label = label
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.size = 0
+
+
+class UndoTree:
+    """A branching undo history with a cursor.
+
+    The tree does not know how to apply ops; undo, redo and jump_to return the ops the
+    caller must revert (in reverse order) or re-apply (in order).
+
+    Instance Attributes:
+        - max_entries: the most action nodes kept, or None for no limit
+        - max_bytes: the most (approximate) bytes of ops kept, or None for no limit
+        - hits: how many undo/redo steps have been served
+        - evictions: how many nodes have been evicted to stay within budget
+        - bytes_held: approximate bytes held by the ops of all nodes
+        - entries: the number of action nodes (the root is not counted)
+
+    Representation Invariants:
+        - self.max_entries is None or self.max_entries >= 1
+        - the cursor is the root or a descendant of the root
+    """
+    max_entries: Optional[int]
+    max_bytes: Optional[int]
+    hits: int
+    evictions: int
+    bytes_held: int
+    entries: int
+
+    # Private Instance Attributes:
+    #   - _root: the oldest state still in the history
+    #   - _cursor: the node of the game's current state
+    #   - _open: the node changes are still added to while it is the cursor (the newest action,
+    #     or the root of a new history), or None
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """Initialize a history holding only the current state."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.evictions = 0
+        self.bytes_held = 0
+        self.entries = 0
+        self._root = UndoNode(None)
+        self._cursor = self._root
+        self._open: Optional[UndoNode] = self._root
+
+    @property
+    def cursor(self) -> UndoNode:
+        """The node of the current state (usable with jump_to)."""
+        return self._cursor
+
+    def __len__(self) -> int:
+        """Return how many actions can be undone from the cursor."""
+        return self._cursor.depth - self._root.depth
+
+    def begin(self, label: str = "") -> None:
+        """Start a new action from the cursor: add it as the newest child and move the cursor to it."""
+        node = UndoNode(self._cursor, label)
+        self._cursor.children.append(node)
+        self._cursor = node
+        self._open = node
+        self.entries += 1
+        self._evict()
+
+    def mark(self) -> UndoNode:
+        """Return the cursor's node (for jump_to), closed to further changes so it keeps its current state."""
+        self._open = None
+        return self._cursor
+
+    def record(self, op: tuple, action: bool = True) -> None:
+        """Record that the current action made the change op.
+
+        If the cursor's node is closed (the cursor has moved to it, or it was marked), op starts a new
+        unlabelled action instead, unless action is False (op is not an action by itself): then it is
+        added to the cursor's node anyway. On the root of a new history op is not kept: it can't be undone.
+
+        >>> tree = UndoTree()
+        >>> tree.begin("go east")
+        >>> tree.begin("go south")
+        >>> tree.undo()
+        []
+        >>> tree.record(("visited", 1, False, True), action=False)
+        >>> len(tree), tree.branches(), tree.cursor.ops
+        (1, 1, [('visited', 1, False, True)])
+        """
+        if self._cursor is not self._open and action:
+            self.begin()
+        node = self._cursor
+        if node is self._root:
+            return
+        node.ops.append(op)
+        size = op_size(op)
+        node.size += size
+        self.bytes_held += size
+        if self.max_bytes is not None and self.bytes_held > self.max_bytes:
+            self._evict()
+
+    def undo(self) -> Optional[list[tuple]]:
+        """Move the cursor to its parent and return the ops to revert, or None if at the root."""
+        node = self._cursor
+        if node is self._root:
+            return None
+        self._cursor = node.parent
+        self.hits += 1
+        return node.ops
+
+    def abandon(self) -> Optional[list[tuple]]:
+        """Move the cursor to its parent and remove the node it was on from the tree (it can't be redone),
+        returning that node's ops to revert, or None if at the root. The parent stays closed."""
+        node = self._cursor
+        if node is self._root:
+            return None
+        self._cursor = node.parent
+        self._cursor.children.remove(node)
+        self.entries -= 1
+        self.bytes_held -= node.size
+        for child in node.children:
+            self._drop(child)
+        return node.ops
+
+    def branches(self) -> int:
+        """Return how many actions can be redone from the cursor."""
+        return len(self._cursor.children)
+
+    def redo(self, branch: int = -1) -> Optional[list[tuple]]:
+        """Move the cursor to its child number <branch> (the newest by default) and return the ops
+        to re-apply, or None if there is no such child."""
+        children = self._cursor.children
+        if not children or not -len(children) <= branch < len(children):
+            return None
+        self._cursor = children[branch]
+        self.hits += 1
+        return self._cursor.ops
+
+    def jump_to(self, node: UndoNode) -> Optional[tuple[list[list[tuple]], list[list[tuple]]]]:
+        """Move the cursor to node.
+
+        Return (to_revert, to_apply): the ops lists to revert (in the order given, each in reverse)
+        and then to re-apply (in the order given), or None if node is no longer in the tree.
+        Only the nodes between the cursor, node and their nearest common ancestor are visited.
+        """
+        if not self._in_tree(node):
+            return None
+
+        up = self._cursor
+        down = node
+        down_path = []
+        while down.depth > up.depth:
+            down_path.append(down)
+            down = down.parent
+        revert = []
+        while up.depth > down.depth:
+            revert.append(up.ops)
+            up = up.parent
+        while up is not down:
+            revert.append(up.ops)
+            down_path.append(down)
+            up = up.parent
+            down = down.parent
+
+        self._cursor = node
+        self.hits += len(revert) + len(down_path)
+        return revert, [n.ops for n in reversed(down_path)]
+
+    def clear(self) -> None:
+        """Forget the whole history (the counters are kept); the current state becomes the root."""
+        self._root = UndoNode(None)
+        self._cursor = self._root
+        self._open = self._root
+        self.entries = 0
+        self.bytes_held = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return the history's counters and current size."""
+        return {
+            'entries': self.entries,
+            'undo_depth': len(self),
+            'hits': self.hits,
+            'evictions': self.evictions,
+            'bytes_held': self.bytes_held
+        }
+
+    def _in_tree(self, node: UndoNode) -> bool:
+        """Return whether node is the root or one of its descendants."""
+        while node.depth > self._root.depth:
+            node = node.parent
+        return node is self._root
+
+    def _drop(self, node: UndoNode) -> None:
+        """Account for the eviction of node and all its descendants."""
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            self.entries -= 1
+            self.evictions += 1
+            self.bytes_held -= n.size
+            stack.extend(n.children)
+
+    def _over_budget(self, slack: int = 0) -> bool:
+        """Return whether the tree holds more than its budget (minus slack entries)."""
+        return (self.max_entries is not None and self.entries > self.max_entries - slack) \
+            or (self.max_bytes is not None and self.bytes_held > self.max_bytes)
+
+    def _evict(self) -> None:
+        """Evict the oldest history until within budget.
+
+        Branches off the cursor's path are dropped first, oldest first; then the root moves
+        along the path towards the cursor. Evicting an eighth of the entry budget at a time
+        keeps the cost amortized O(1) per action.
+        """
+        if not self._over_budget():
+            return
+        slack = (self.max_entries or 0) // 8
+
+        path = []  # the nodes from the cursor up to (not including) the root
+        node = self._cursor
+        while node is not self._root:
+            path.append(node)
+            node = node.parent
+
+        while path and self._over_budget(slack):
+            root = self._root
+            on_path = path.pop()
+            for child in [c for c in root.children if c is not on_path]:
+                root.children.remove(child)
+                self._drop(child)
+                if not self._over_budget(slack):
+                    return
+            # only the path to the cursor is left: its next node becomes the root
+            if on_path is self._cursor:
+                break
+            self.entries -= 1
+            self.evictions += 1
+            self.bytes_held -= on_path.size
+            on_path.ops = []
+            on_path.size = 0
+            on_path.parent = None
+            self._root = on_path
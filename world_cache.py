@@ -0,0 +1,194 @@
+"""CSC111 Project 1: Text Adventure Game - Loaded-World Cache
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module keeps a small, process-wide LRU cache of parsed game data files, so
+creating another game (or simulation) for a world that has already been loaded skips
+opening and parsing the JSON file, and skips validating it again for the same start.
+
+Entries are keyed by the file's absolute path and checked against its (mtime, size) on
+every lookup, so an edited file is always re-read. The (mtime, size) is taken before the
+file is read, and a file that changed while it was being read is read again. The cache may be used from several
+threads at once (a file is then still only parsed once). The cached data is shared by every
+game built from it and must be treated as read-only: games build their own Location and
+Item objects from it (sharing the strings and command dicts, which games never mutate).
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from world_graph import WorldGraph
+from world_shards import files_stamp, read_world
+from world_validator import validate_world_data
+
+# The number of parsed worlds kept by the process-wide cache
+WORLD_CACHE_MAX_ENTRIES = 8
+
+# How many times a file that changes while it is being read is read again
+WORLD_CACHE_READ_ATTEMPTS = 3
+
+
+class _CachedWorld:
+    """A parsed game data file (or sharded world), and the validation results and location graph
+    computed for it so far."""
+    __slots__ = ("stamp", "shards", "data", "problems", "graph")
+    stamp: tuple[tuple[int, int], ...]
+    shards: list[str]
+    data: dict
+    problems: dict[int, list[str]]
+    graph: Optional[WorldGraph]
+
+    def __init__(self, stamp: tuple[tuple[int, int], ...], shards: list[str], data: dict) -> None:
+        self.stamp = stamp
+        self.shards = shards
+        self.data = data
+        self.problems = {}
+        self.graph = None
+
+
+class WorldCache:
+    """A size-bounded LRU cache of parsed game data files.
+
+    A file may be a shard manifest (see world_shards); its world is then reloaded when the
+    manifest or any of its shards changes.
+
+    Instance Attributes:
+        - max_entries: the most worlds kept; the least recently used one is evicted first
+        - hits: how many lookups were served from the cache
+        - misses: how many lookups had to read and parse the file
+        - evictions: how many worlds were evicted to stay within max_entries
+
+    Representation Invariants:
+        - self.max_entries >= 1
+    """
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+
+    # Private Instance Attributes:
+    #   - _entries: absolute path -> cached world, least recently used first
+    #   - _lock: serializes lookups (and the validations stored in entries)
+
+    def __init__(self, max_entries: int = WORLD_CACHE_MAX_ENTRIES) -> None:
+        """Initialize an empty cache holding at most max_entries worlds."""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, _CachedWorld] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Return the number of worlds currently cached."""
+        return len(self._entries)
+
+    def load(self, filename: str) -> dict:
+        """Return the parsed contents of filename (read-only), reading it only if it is not
+        cached or has changed on disk since it was cached."""
+        return self._lookup(filename).data
+
+    def validate(self, filename: str, start_id: int) -> list[str]:
+        """Return validate_world_data for the contents of filename and start_id, computing it
+        only once per version of the file and start id."""
+        with self._lock:
+            entry = self._lookup(filename)
+            problems = entry.problems.get(start_id)
+            if problems is None:
+                problems = validate_world_data(entry.data, start_id)
+                entry.problems[start_id] = problems
+            return problems
+
+    def graph(self, filename: str) -> WorldGraph:
+        """Return the location graph of the contents of filename (read-only; use WorldGraph.overlay
+        to patch it), building it only once per version of the file."""
+        with self._lock:
+            entry = self._lookup(filename)
+            if entry.graph is None:
+                entry.graph = WorldGraph.from_world_data(entry.data)
+            return entry.graph
+
+    def clear(self) -> None:
+        """Forget every cached world (the counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return the cache's counters and current size."""
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+    def _lookup(self, filename: str) -> _CachedWorld:
+        """Return the up-to-date cache entry of filename, reading the file (and its shards) on a miss.
+
+        A file edited while it is being read is read again (not cached as the old contents):
+        >>> import json, tempfile, world_cache
+        >>> path = os.path.join(tempfile.mkdtemp(), "world.json")
+        >>> def write(name: str) -> None:
+        ...     with open(path, 'w', encoding='utf-8') as f:
+        ...         json.dump({"locations": [], "items": [], "name": name}, f)
+        >>> def read_then_edit(filename: str) -> tuple[dict, list[str]]:
+        ...     world_cache.read_world = read_world  # only the first read is interrupted
+        ...     result = read_world(filename)
+        ...     write("edited")
+        ...     return result
+        >>> write("original")
+        >>> world_cache.read_world = read_then_edit
+        >>> cache = WorldCache()
+        >>> cache.load(path)["name"], cache.load(path)["name"], cache.misses
+        ('edited', 'edited', 1)
+        """
+        path = os.path.abspath(filename)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.stamp == files_stamp([path] + entry.shards):
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            shards = entry.shards if entry is not None else []
+            for _ in range(WORLD_CACHE_READ_ATTEMPTS):
+                # Stamp before reading: a write that lands during the read leaves the entry stale, not
+                # cached as up to date with the old contents
+                stamp = files_stamp([path] + shards)
+                data, read_shards = read_world(path)
+                if read_shards == shards and files_stamp([path] + shards) == stamp:
+                    break
+                shards = read_shards  # changed while reading (or now lists other shards): read again
+            entry = _CachedWorld(stamp, read_shards, data)
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return entry
+
+
+# The cache shared by every game and simulation in this process
+WORLD_CACHE = WorldCache()
+
+
+def load_world(filename: str) -> Any:
+    """Return the parsed contents of filename from the process-wide cache (read-only)."""
+    return WORLD_CACHE.load(filename)
@@ -0,0 +1,212 @@
+"""CSC111 Project 1: Text Adventure Game - Procedural World Generator
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module generates large, seeded game worlds in the same JSON schema as
+game_data.json, for load testing. Worlds are written to disk one location at a time,
+so generating millions of locations only needs memory for the graph itself. A world
+can also be written as a shard manifest plus shard files (see world_shards).
+
+Every generated world is solvable: all moves are two-way and the graph is connected,
+so every location (in particular every item's start and target position) can be
+reached from every other one, and no item starts at its own target.
+
+Usage: python world_generator.py <output.json> <n_locations> [grid|tree|small-world] [seed] [n_items] [shards]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import os
+import random
+from typing import Callable, Iterable, Iterator
+
+SHAPES: tuple[str, ...] = ("grid", "tree", "small-world")
+
+# Directions from a tree node to its (at most 3) children; "go south" leads back to the parent
+TREE_CHILD_DIRECTIONS: tuple[str, ...] = ("north", "east", "west")
+
+
+def _grid_commands(n: int) -> Callable[[int], dict[str, int]]:
+    """Return a function giving the commands of each node (0-based) of a row-major grid of n nodes."""
+    width = max(1, math.isqrt(n - 1) + 1) if n > 1 else 1
+
+    def commands(i: int) -> dict[str, int]:
+        cmds = {}
+        if i - width >= 0:
+            cmds["go north"] = i - width
+        if i + width < n:
+            cmds["go south"] = i + width
+        if i % width != width - 1 and i + 1 < n:
+            cmds["go east"] = i + 1
+        if i % width != 0:
+            cmds["go west"] = i - 1
+        return cmds
+    return commands
+
+
+def _tree_commands(n: int, rng: random.Random) -> Callable[[int], dict[str, int]]:
+    """Return a function giving the commands of each node of a random tree of n nodes
+    in which every node has at most len(TREE_CHILD_DIRECTIONS) children."""
+    parent = [-1] * n
+    children: list[list[int]] = [[] for _ in range(n)]
+    open_nodes = [0]  # nodes that can still take another child
+
+    for i in range(1, n):
+        k = rng.randrange(len(open_nodes))
+        p = open_nodes[k]
+        parent[i] = p
+        children[p].append(i)
+        if len(children[p]) == len(TREE_CHILD_DIRECTIONS):
+            open_nodes[k] = open_nodes[-1]
+            open_nodes.pop()
+        open_nodes.append(i)
+
+    def commands(i: int) -> dict[str, int]:
+        cmds = {f"go {d}": c for d, c in zip(TREE_CHILD_DIRECTIONS, children[i])}
+        if parent[i] >= 0:
+            cmds["go south"] = parent[i]
+        return cmds
+    return commands
+
+
+def _small_world_commands(n: int, rng: random.Random, shortcut_rate: float) -> Callable[[int], dict[str, int]]:
+    """Return a function giving the commands of each node of a ring of n nodes (east/west)
+    plus random two-way shortcuts ("go portal <id>"), in the style of a Watts-Strogatz graph."""
+    shortcuts: dict[int, list[int]] = {}
+    if n > 2:
+        for i in range(n):
+            if rng.random() < shortcut_rate:
+                j = rng.randrange(n)
+                if j != i and j not in shortcuts.get(i, ()):
+                    shortcuts.setdefault(i, []).append(j)
+                    shortcuts.setdefault(j, []).append(i)
+
+    def commands(i: int) -> dict[str, int]:
+        cmds = {}
+        if n > 1:
+            cmds["go east"] = (i + 1) % n
+            cmds["go west"] = (i - 1) % n
+        for j in shortcuts.get(i, ()):
+            cmds[f"go portal {j + 1}"] = j
+        return cmds
+    return commands
+
+
+def _location_records(n: int, commands: Callable[[int], dict[str, int]],
+                      items_at: dict[int, list[str]]) -> Iterator[dict]:
+    """Yield the JSON record of each location, with ids 1..n."""
+    for i in range(n):
+        loc_id = i + 1
+        yield {
+            "id": loc_id,
+            "name": f"Room {loc_id}",
+            "brief_description": f"You are in room {loc_id}.",
+            "long_description": f"You are in room {loc_id} of a very large campus. Every hallway looks the same.",
+            "available_commands": {cmd: target + 1 for cmd, target in commands(i).items()},
+            "items": items_at.get(i, [])
+        }
+
+
+def _write_records(filename: str, sections: list[tuple[str, Iterable[dict]]]) -> None:
+    """Write a JSON object to filename with a list of records under each key of sections,
+    one record per line, streaming the records."""
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write('{')
+        for k, (key, records) in enumerate(sections):
+            f.write((',\n' if k > 0 else '\n') + f'  "{key}": [\n')
+            for i, record in enumerate(records):
+                if i > 0:
+                    f.write(",\n")
+                f.write("    " + json.dumps(record))
+            f.write('\n  ]')
+        f.write('\n}\n')
+
+
+def generate_world(filename: str, n_locations: int, shape: str = "grid", seed: int = 0,
+                   n_items: int = 4, shortcut_rate: float = 0.05, shards: int = 1) -> int:
+    """Write a solvable world with n_locations locations to filename and return its starting location id.
+
+    shape is one of SHAPES. shortcut_rate is the chance that a small-world node gets a shortcut.
+    If shards > 1, filename is written as a manifest, the locations are split into <shards>
+    location shards of consecutive ids and the items go in one item shard, next to filename
+    (e.g. big.json lists big.locations-0.json, ..., big.items-0.json).
+
+    Preconditions:
+        - n_locations >= 2
+        - n_items >= 0
+        - shards >= 1
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown world shape: {shape}")
+    rng = random.Random(seed)
+
+    if shape == "grid":
+        commands = _grid_commands(n_locations)
+    elif shape == "tree":
+        commands = _tree_commands(n_locations, rng)
+    else:
+        commands = _small_world_commands(n_locations, rng, shortcut_rate)
+
+    items = []
+    items_at: dict[int, list[str]] = {}
+    for k in range(n_items):
+        start = rng.randrange(n_locations)
+        target = rng.randrange(n_locations - 1)
+        if target >= start:
+            target += 1  # never start an item at its own target
+        name = f"item {k + 1}"
+        items_at.setdefault(start, []).append(name)
+        items.append({
+            "name": name,
+            "description": f"Lost item number {k + 1}.",
+            "start_position": start + 1,
+            "target_position": target + 1,
+            "target_points": 5
+        })
+
+    records = _location_records(n_locations, commands, items_at)
+    if shards <= 1:
+        _write_records(filename, [("locations", records), ("items", items)])
+        return 1
+
+    stem = os.path.splitext(filename)[0]
+    location_shards = []
+    for k in range(shards):
+        path = f"{stem}.locations-{k}.json"
+        size = n_locations * (k + 1) // shards - n_locations * k // shards
+        _write_records(path, [("locations", itertools.islice(records, size))])
+        location_shards.append(os.path.basename(path))
+    item_shard = f"{stem}.items-0.json"
+    _write_records(item_shard, [("items", items)])
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump({"location_shards": location_shards, "item_shards": [os.path.basename(item_shard)]}, f, indent=2)
+
+    return 1
+
+
+if __name__ == "__main__":
+    import sys
+
+    out_file = sys.argv[1]
+    size = int(sys.argv[2])
+    graph_shape = sys.argv[3] if len(sys.argv) > 3 else "grid"
+    world_seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    item_count = int(sys.argv[5]) if len(sys.argv) > 5 else 4
+    shard_count = int(sys.argv[6]) if len(sys.argv) > 6 else 1
+
+    start_id = generate_world(out_file, size, graph_shape, world_seed, item_count, shards=shard_count)
+    print(f"Wrote {size} {graph_shape} locations to {out_file} (start at location {start_id}).")
@@ -0,0 +1,244 @@
+"""CSC111 Project 1: Text Adventure Game - Compressed Location Graph
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module stores the location graph of a world (which command leads from which
+location to which) in compressed sparse row (CSR) form: every command string is interned
+once, and each location's commands are a slice of two flat arrays of command ids and
+target ids. This takes a fraction of the memory of one dict per location, and moving is
+a short scan of a location's few edges with no string building or hashing.
+
+A graph built from a cached world (see world_cache.WorldCache.graph) is shared by every
+game of that world. A graph can also be saved to a directory as raw arrays (see save) and
+loaded back without parsing the world again (used by region_store). Each game uses its own
+overlay, which can replace the commands of single locations (e.g. on hot reload) without
+touching the shared arrays.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from array import array
+from typing import Optional
+
+
+class WorldGraph:
+    """The commands of every location, in CSR form, plus per-location overrides.
+
+    Instance Attributes:
+        - commands: the command intern table: command id -> command
+
+    Representation Invariants:
+        - len(self._offsets) == number of rows + 1
+        - len(self._edge_commands) == len(self._edge_targets) == self._offsets[-1]
+    """
+    commands: list[str]
+
+    # Private Instance Attributes:
+    #   - _command_ids: command -> command id
+    #   - _go_ids: direction -> the command id of "go <direction>"
+    #   - _base: when the location ids are base, base + 1, ..., the id of row 0 (and _rows is None)
+    #   - _rows: otherwise, location id -> row
+    #   - _offsets: the edges of row r are _offsets[r] .. _offsets[r + 1] - 1
+    #   - _edge_commands, _edge_targets: the command id and target location id of each edge
+    #   - _overrides: location id -> (command ids, target ids) replacing its row, or None if removed
+    #   - _shared_table: whether the intern table is still shared with the graph this is an overlay of
+
+    def __init__(self) -> None:
+        """Initialize an empty graph."""
+        self.commands = []
+        self._command_ids: dict[str, int] = {}
+        self._go_ids: dict[str, int] = {}
+        self._base: Optional[int] = 0
+        self._rows: Optional[dict[int, int]] = None
+        self._offsets = array('q', [0])
+        self._edge_commands = array('i')
+        self._edge_targets = array('q')
+        self._overrides: dict[int, Optional[tuple[tuple[int, ...], tuple[int, ...]]]] = {}
+        self._shared_table = False
+
+    @staticmethod
+    def from_world_data(data: dict) -> WorldGraph:
+        """Return the graph of the locations in parsed world data (in the game data JSON schema)."""
+        graph = WorldGraph()
+        locations = data['locations']
+        ids = [loc['id'] for loc in locations]
+        if ids and ids == list(range(ids[0], ids[0] + len(ids))):
+            graph._base = ids[0]
+        else:
+            graph._base = None
+            graph._rows = {loc_id: row for row, loc_id in enumerate(ids)}
+
+        intern = graph._intern
+        offsets = graph._offsets
+        edge_commands = graph._edge_commands
+        edge_targets = graph._edge_targets
+        for loc in locations:
+            for command, target in loc['available_commands'].items():
+                edge_commands.append(intern(command))
+                edge_targets.append(target)
+            offsets.append(len(edge_commands))
+        return graph
+
+    def overlay(self) -> WorldGraph:
+        """Return a graph sharing this graph's arrays (which must not change afterwards), with its own
+        overrides, so one game can patch locations without affecting others."""
+        graph = WorldGraph()
+        graph.commands = self.commands
+        graph._command_ids = self._command_ids
+        graph._go_ids = self._go_ids
+        graph._base = self._base
+        graph._rows = self._rows
+        graph._offsets = self._offsets
+        graph._edge_commands = self._edge_commands
+        graph._edge_targets = self._edge_targets
+        graph._overrides = dict(self._overrides)
+        graph._shared_table = True
+        return graph
+
+    def save(self, dirname: str) -> None:
+        """Write the shared arrays and intern table to the directory dirname (created if needed).
+        Overrides are not saved."""
+        os.makedirs(dirname, exist_ok=True)
+        with open(os.path.join(dirname, "graph.json"), 'w', encoding='utf-8') as f:
+            json.dump({"commands": self.commands, "base": self._base}, f)
+        arrays = {"offsets": self._offsets, "edge_commands": self._edge_commands, "edge_targets": self._edge_targets}
+        if self._rows is not None:
+            arrays["ids"] = array('q', sorted(self._rows, key=self._rows.__getitem__))
+        for name, values in arrays.items():
+            with open(os.path.join(dirname, f"graph-{name}.bin"), 'wb') as f:
+                values.tofile(f)
+
+    @staticmethod
+    def load(dirname: str) -> WorldGraph:
+        """Return the graph saved in the directory dirname."""
+        graph = WorldGraph()
+        with open(os.path.join(dirname, "graph.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        for command in meta["commands"]:
+            graph._intern(command)
+        graph._base = meta["base"]
+        arrays = {"offsets": array('q'), "edge_commands": array('i'), "edge_targets": array('q')}
+        if graph._base is None:
+            arrays["ids"] = array('q')
+        for name, values in arrays.items():
+            path = os.path.join(dirname, f"graph-{name}.bin")
+            with open(path, 'rb') as f:
+                values.fromfile(f, os.path.getsize(path) // values.itemsize)
+        graph._offsets = arrays["offsets"]
+        graph._edge_commands = arrays["edge_commands"]
+        graph._edge_targets = arrays["edge_targets"]
+        if graph._base is None:
+            graph._rows = {loc_id: row for row, loc_id in enumerate(arrays["ids"])}
+        return graph
+
+    def __contains__(self, loc_id: int) -> bool:
+        """Return whether the graph has a location with id loc_id."""
+        if loc_id in self._overrides:
+            return self._overrides[loc_id] is not None
+        return self.row(loc_id) is not None
+
+    def command_id(self, command: str) -> Optional[int]:
+        """Return the id of command, or None if no location has it."""
+        return self._command_ids.get(command)
+
+    def target(self, loc_id: int, command: str) -> Optional[int]:
+        """Return the id of the location command leads to from loc_id, or None if it isn't available there."""
+        cid = self._command_ids.get(command)
+        return None if cid is None else self._target(loc_id, cid)
+
+    def go_target(self, loc_id: int, direction: str) -> Optional[int]:
+        """Return the id of the location "go <direction>" leads to from loc_id, or None if it isn't available
+        there (without building the command string)."""
+        cid = self._go_ids.get(direction)
+        return None if cid is None else self._target(loc_id, cid)
+
+    def commands_of(self, loc_id: int) -> dict[str, int]:
+        """Return the commands available at loc_id, mapped to the location ids they lead to."""
+        cids, targets = self._edges(loc_id)
+        return {self.commands[cid]: target for cid, target in zip(cids, targets)}
+
+    def set_commands(self, loc_id: int, commands: dict[str, int]) -> None:
+        """Make commands the commands of loc_id (adding the location if it is new)."""
+        self._overrides[loc_id] = (tuple(self._intern(command) for command in commands), tuple(commands.values()))
+
+    def remove_location(self, loc_id: int) -> None:
+        """Remove loc_id and its commands (commands elsewhere that lead to it are left alone)."""
+        self._overrides[loc_id] = None
+
+    def edge_count(self) -> int:
+        """Return the number of commands in the shared arrays (not counting overrides)."""
+        return len(self._edge_targets)
+
+    def nbytes(self) -> int:
+        """Return the approximate memory held by the graph's arrays, row index and intern table."""
+        total = sum(sys.getsizeof(a) for a in (self._offsets, self._edge_commands, self._edge_targets))
+        total += sys.getsizeof(self.commands) + sys.getsizeof(self._command_ids) + sys.getsizeof(self._go_ids)
+        total += sum(sys.getsizeof(command) for command in self.commands)
+        if self._rows is not None:
+            total += sys.getsizeof(self._rows)
+        return total
+
+    def row(self, loc_id: int) -> Optional[int]:
+        """Return the row of loc_id in the shared arrays (its position in the world data the graph was
+        built from), or None if it has none."""
+        if self._rows is not None:
+            return self._rows.get(loc_id)
+        row = loc_id - self._base
+        return row if 0 <= row < len(self._offsets) - 1 else None
+
+    def _edges(self, loc_id: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        """Return the (command ids, target ids) of loc_id; both are empty if it doesn't exist."""
+        if loc_id in self._overrides:
+            return self._overrides[loc_id] or ((), ())
+        row = self.row(loc_id)
+        if row is None:
+            return (), ()
+        start, stop = self._offsets[row], self._offsets[row + 1]
+        return tuple(self._edge_commands[start:stop]), tuple(self._edge_targets[start:stop])
+
+    def _target(self, loc_id: int, cid: int) -> Optional[int]:
+        """Return the target of the command with id cid at loc_id, or None."""
+        if self._overrides and loc_id in self._overrides:
+            override = self._overrides[loc_id]
+            if override is None or cid not in override[0]:
+                return None
+            return override[1][override[0].index(cid)]
+        row = self.row(loc_id)
+        if row is None:
+            return None
+        edge_commands = self._edge_commands
+        for edge in range(self._offsets[row], self._offsets[row + 1]):
+            if edge_commands[edge] == cid:
+                return self._edge_targets[edge]
+        return None
+
+    def _intern(self, command: str) -> int:
+        """Return the id of command, adding it to the intern table if it is new."""
+        cid = self._command_ids.get(command)
+        if cid is not None:
+            return cid
+        if self._shared_table:  # copy the table before changing it
+            self.commands = list(self.commands)
+            self._command_ids = dict(self._command_ids)
+            self._go_ids = dict(self._go_ids)
+            self._shared_table = False
+        cid = len(self.commands)
+        self.commands.append(command)
+        self._command_ids[command] = cid
+        if command.startswith("go "):
+            self._go_ids[command[3:]] = cid
+        return cid
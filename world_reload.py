@@ -0,0 +1,189 @@
+"""CSC111 Project 1: Text Adventure Game - World Hot-Reload
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module watches a game data file and patches running games when it changes,
+without restarting them. The new file is diffed against the version that was last
+loaded, and only the locations and items that actually changed are patched in each
+registered game (see AdventureGame.apply_world_diff). Per-session state such as where
+the items are and which locations were visited is preserved.
+
+Reading and parsing the file is unavoidably proportional to its size; comparing it to
+the loaded version only compares one fingerprint per record, and the patching done in
+each game is proportional to the size of the diff.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from world_shards import files_stamp, read_world
+from world_validator import WorldValidationError, validate_world_data
+
+
+@dataclass
+class WorldDiff:
+    """The differences between two versions of a world.
+
+    Instance Attributes:
+        - changed_locations: location id -> new record, for locations whose descriptions or commands changed
+        - added_locations: location id -> record, for new locations
+        - removed_locations: the ids of locations that no longer exist
+        - changed_items: item name -> new record, for items whose fields changed
+        - added_items: item name -> record, for new items
+        - removed_items: the names of items that no longer exist
+    """
+    changed_locations: dict[int, dict] = field(default_factory=dict)
+    added_locations: dict[int, dict] = field(default_factory=dict)
+    removed_locations: list[int] = field(default_factory=list)
+    changed_items: dict[str, dict] = field(default_factory=dict)
+    added_items: dict[str, dict] = field(default_factory=dict)
+    removed_items: list[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        """Return whether the two versions of the world are the same."""
+        return not (self.changed_locations or self.added_locations or self.removed_locations
+                    or self.changed_items or self.added_items or self.removed_items)
+
+    def size(self) -> int:
+        """Return the number of locations and items that differ."""
+        return len(self.changed_locations) + len(self.added_locations) + len(self.removed_locations) \
+            + len(self.changed_items) + len(self.added_items) + len(self.removed_items)
+
+
+def _location_fingerprint(record: dict) -> int:
+    """Return a fingerprint of the parts of a location record a running game can be patched with.
+    (The record's item list is only a starting placement, so it is not part of the fingerprint.)"""
+    return hash((record['brief_description'], record['long_description'],
+                 tuple(record['available_commands'].items())))
+
+
+def _item_fingerprint(record: dict) -> int:
+    """Return a fingerprint of an item record."""
+    return hash((record['description'], record['start_position'], record['target_position'],
+                 record['target_points']))
+
+
+class WorldWatcher:
+    """Watches a game data file and patches the registered games when it changes.
+
+    Call poll periodically (e.g. between commands); it is cheap when the file hasn't changed.
+    The file may be a shard manifest (see world_shards): a change to any shard reloads the world.
+
+    Instance Attributes:
+        - filename: the watched file
+        - reloads: how many times a changed file has been applied
+    """
+    filename: str
+    reloads: int
+
+    # Private Instance Attributes:
+    #   - _stamp: (mtime_ns, size) of the file and of each shard when it was last loaded
+    #   - _shards: the shard files of the loaded version (empty unless the file is a manifest)
+    #   - _locations: location id -> fingerprint, for the loaded version
+    #   - _items: item name -> fingerprint, for the loaded version
+    #   - _games: the games to patch
+
+    def __init__(self, filename: str) -> None:
+        """Start watching filename, taking its current contents as the loaded version."""
+        self.filename = filename
+        self.reloads = 0
+        self._games: list[Any] = []
+        self._shards: list[str] = []
+        data = self._read()
+        self._stamp = self._file_stamp()
+        self._locations, self._items = self._fingerprints(data)
+
+    def register(self, game: Any) -> None:
+        """Patch game (an AdventureGame loaded from the watched file) on every reload.
+
+        Raise ValueError if game is paged in from a region store (see AdventureGame.apply_world_diff).
+        """
+        if game.region_stats():
+            raise ValueError("a game paged in from a region store can't be patched by a hot reload")
+        self._games.append(game)
+
+    def unregister(self, game: Any) -> None:
+        """Stop patching game."""
+        self._games.remove(game)
+
+    def poll(self) -> Optional[WorldDiff]:
+        """If the file changed since it was last loaded, reload it, patch every registered game
+        and return the diff; otherwise return None.
+
+        Raise WorldValidationError (and patch nothing) if the new file is not a valid world
+        for one of the registered games.
+        """
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return None
+        shards = self._shards
+        data = self._read()
+        if self._shards != shards:  # the manifest now lists other shards
+            stamp = self._file_stamp()
+        for start_id in {game.get_start_location_id() for game in self._games}:
+            problems = validate_world_data(data, start_id)
+            if problems:
+                raise WorldValidationError(self.filename, problems)
+
+        diff = self._diff(data)
+        for game in self._games:
+            game.apply_world_diff(diff)
+        self._stamp = stamp
+        self.reloads += 1
+        return diff
+
+    def _file_stamp(self) -> tuple[tuple[int, int], ...]:
+        """Return the (mtime_ns, size) of the watched file and of each of its shards."""
+        return files_stamp([self.filename] + self._shards)
+
+    def _read(self) -> dict:
+        """Return the parsed world in the watched file (and its shards, which are remembered)."""
+        data, self._shards = read_world(self.filename)
+        return data
+
+    @staticmethod
+    def _fingerprints(data: dict) -> tuple[dict[int, int], dict[str, int]]:
+        """Return the location and item fingerprints of a parsed world."""
+        return ({loc['id']: _location_fingerprint(loc) for loc in data['locations']},
+                {item['name']: _item_fingerprint(item) for item in data['items']})
+
+    def _diff(self, data: dict) -> WorldDiff:
+        """Return the diff from the loaded version to data, and make data the loaded version."""
+        diff = WorldDiff()
+        new_locations = {}
+        for loc in data['locations']:
+            fingerprint = _location_fingerprint(loc)
+            new_locations[loc['id']] = fingerprint
+            old = self._locations.get(loc['id'])
+            if old is None:
+                diff.added_locations[loc['id']] = loc
+            elif old != fingerprint:
+                diff.changed_locations[loc['id']] = loc
+        diff.removed_locations = [loc_id for loc_id in self._locations if loc_id not in new_locations]
+
+        new_items = {}
+        for item in data['items']:
+            fingerprint = _item_fingerprint(item)
+            new_items[item['name']] = fingerprint
+            old = self._items.get(item['name'])
+            if old is None:
+                diff.added_items[item['name']] = item
+            elif old != fingerprint:
+                diff.changed_items[item['name']] = item
+        diff.removed_items = [name for name in self._items if name not in new_items]
+
+        self._locations, self._items = new_locations, new_items
+        return diff
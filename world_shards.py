@@ -0,0 +1,118 @@
+"""CSC111 Project 1: Text Adventure Game - Sharded World Files
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module loads worlds that are split across several files. A sharded world is
+described by a manifest, a small JSON file listing its shards (paths relative to the
+manifest):
+
+    {"location_shards": ["campus.locations-0.json", ...], "item_shards": ["campus.items-0.json"]}
+
+Each location shard is {"locations": [...]} and each item shard is {"items": [...]}, in the
+same schema as game_data.json. The shards are parsed concurrently in worker processes and
+concatenated (in manifest order) into one world in the usual schema. References between
+shards (commands leading to locations in other shards, item positions, duplicate ids) are
+checked on the merged world by world_validator, like any other world.
+
+Anywhere a game data file is accepted, a manifest can be given instead (see read_world).
+Parsing is spread across processes; only the transfer of each parsed shard back to this
+process (unpickling, several times cheaper than parsing JSON) is serial.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+MANIFEST_KEYS: tuple[str, str] = ("location_shards", "item_shards")
+
+
+def is_manifest(data: object) -> bool:
+    """Return whether parsed JSON data is a shard manifest (rather than a world)."""
+    return isinstance(data, dict) and MANIFEST_KEYS[0] in data
+
+
+def shard_paths(manifest_file: str, manifest: dict) -> tuple[list[str], list[str]]:
+    """Return the paths of the (location shards, item shards) listed in manifest, which was read from
+    manifest_file."""
+    base = os.path.dirname(os.path.abspath(manifest_file))
+    return ([os.path.join(base, p) for p in manifest.get(MANIFEST_KEYS[0], [])],
+            [os.path.join(base, p) for p in manifest.get(MANIFEST_KEYS[1], [])])
+
+
+def files_stamp(paths: list[str]) -> tuple[tuple[int, int], ...]:
+    """Return the (mtime_ns, size) of every file in paths, to tell whether any of them changed."""
+    stamps = []
+    for path in paths:
+        st = os.stat(path)
+        stamps.append((st.st_mtime_ns, st.st_size))
+    return tuple(stamps)
+
+
+def _parse_shard(job: tuple[str, str]) -> list:
+    """Return the records under key in the shard file at path (run in a worker process)."""
+    path, key = job
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)[key]
+
+
+def load_shards(manifest_file: str, manifest: dict, processes: Optional[int] = None) -> dict:
+    """Return the world made of the shards listed in manifest (read from manifest_file), parsing the
+    shards on <processes> worker processes (None: one per CPU, at most one per shard; 1: in this process).
+
+    A daemon process (e.g. a multiprocessing.Pool worker, like the ones replay.verify_sessions uses)
+    can't start worker processes of its own, so it always parses the shards itself.
+
+    >>> import tempfile
+    >>> from multiprocessing import Pool
+    >>> from world_generator import generate_world
+    >>> manifest_file = os.path.join(tempfile.mkdtemp(), "world.json")
+    >>> _ = generate_world(manifest_file, 60, shards=3)
+    >>> with Pool(1) as pool:
+    ...     world, shards = pool.apply(read_world, (manifest_file, 2))
+    >>> (world, shards) == read_world(manifest_file, 2), len(shards)
+    (True, 4)
+    """
+    location_shards, item_shards = shard_paths(manifest_file, manifest)
+    jobs = [(path, "locations") for path in location_shards] + [(path, "items") for path in item_shards]
+
+    if processes is None:
+        processes = min(len(jobs), os.cpu_count() or 1)
+    if processes <= 1 or len(jobs) <= 1 or multiprocessing.current_process().daemon:
+        parts = [_parse_shard(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            parts = list(pool.map(_parse_shard, jobs))
+
+    world = {"locations": [], "items": []}
+    for (_, key), records in zip(jobs, parts):
+        world[key].extend(records)
+    return world
+
+
+def read_world(filename: str, processes: Optional[int] = None) -> tuple[dict, list[str]]:
+    """Return the parsed world in filename, and the shard files it was loaded from.
+
+    filename is either a game data file (and there are no shard files) or a manifest, whose
+    shards are then loaded by load_shards.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not is_manifest(data):
+        return data, []
+    location_shards, item_shards = shard_paths(filename, data)
+    return load_shards(filename, data, processes), location_shards + item_shards
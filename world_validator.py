@@ -0,0 +1,157 @@
+"""CSC111 Project 1: Text Adventure Game - World Validator
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module checks a loaded world (the parsed JSON of a game data file) for
+problems that would otherwise only show up mid-game: missing fields, duplicate ids or
+names, commands leading to locations that don't exist, locations that can't be reached
+from the start, and items whose start or target position can't be reached.
+
+All checks happen in a single O(V + E) pass over the location graph, so the validator is
+cheap enough to run every time a world is loaded.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+
+from typing import Any
+
+LOCATION_KEYS: tuple[str, ...] = ("id", "brief_description", "long_description", "available_commands", "items")
+ITEM_KEYS: tuple[str, ...] = ("name", "description", "start_position", "target_position", "target_points")
+_LOCATION_KEY_SET = frozenset(LOCATION_KEYS)
+_ITEM_KEY_SET = frozenset(ITEM_KEYS)
+
+# At most this many example ids/names are listed per kind of problem, so reports on huge worlds stay short
+MAX_EXAMPLES = 5
+
+
+class WorldValidationError(ValueError):
+    """Raised when a game data file fails validation.
+
+    Instance Attributes:
+        - filename: the file that failed validation
+        - problems: a description of each problem found
+    """
+    filename: str
+    problems: list[str]
+
+    def __init__(self, filename: str, problems: list[str]) -> None:
+        self.filename = filename
+        self.problems = problems
+        super().__init__(f"{filename} is not a valid world:\n  - " + "\n  - ".join(problems))
+
+
+def _describe(what: str, examples: list, count: int) -> str:
+    """Return a one-line problem description listing up to MAX_EXAMPLES examples of count offenders."""
+    shown = ", ".join(repr(x) for x in examples[:MAX_EXAMPLES])
+    more = f" and {count - MAX_EXAMPLES} more" if count > MAX_EXAMPLES else ""
+    return f"{what}: {shown}{more}"
+
+
+def validate_world_data(data: Any, start_id: int) -> list[str]:
+    """Return a description of every problem in the parsed world data, for a game starting at start_id.
+
+    An empty list means the world is valid.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('locations'), list) \
+            or not isinstance(data.get('items'), list):
+        return ["the world must be an object with a 'locations' list and an 'items' list"]
+
+    problems = []
+
+    # Pass 1 over locations: fields, duplicate ids/names
+    adjacency: dict[int, Any] = {}  # location id -> the targets of its commands
+    missing_fields = []
+    duplicate_ids = []
+    seen_names = set()
+    duplicate_names = []
+    listed_items: list[tuple[int, str]] = []
+    for loc in data['locations']:
+        if not isinstance(loc, dict) or not loc.keys() >= _LOCATION_KEY_SET:
+            missing_fields.append(loc.get('id') if isinstance(loc, dict) else loc)
+            continue
+        loc_id = loc['id']
+        if loc_id in adjacency:
+            duplicate_ids.append(loc_id)
+        adjacency[loc_id] = loc['available_commands'].values()
+        name = loc.get('name')
+        if name is not None:
+            if name in seen_names:
+                duplicate_names.append(name)
+            seen_names.add(name)
+        if loc['items']:
+            listed_items.extend((loc_id, item_name) for item_name in loc['items'])
+
+    if missing_fields:
+        problems.append(_describe(f"locations missing one of {LOCATION_KEYS}", missing_fields, len(missing_fields)))
+    if duplicate_ids:
+        problems.append(_describe("duplicate location ids", duplicate_ids, len(duplicate_ids)))
+    if duplicate_names:
+        problems.append(_describe("duplicate location names", duplicate_names, len(duplicate_names)))
+
+    # Pass 2 over edges: dangling targets, reachability from the start (iterative DFS)
+    dangling: dict[Any, None] = {}  # ordered set
+    reachable = set()
+    if start_id not in adjacency:
+        problems.append(f"the starting location {start_id!r} does not exist")
+    else:
+        reachable.add(start_id)
+        stack = [start_id]
+        while stack:
+            for target in adjacency[stack.pop()]:
+                if target not in reachable:
+                    if target in adjacency:
+                        reachable.add(target)
+                        stack.append(target)
+                    else:
+                        dangling[target] = None
+        for loc_id, targets in adjacency.items():
+            if loc_id not in reachable:
+                dangling.update((t, None) for t in targets if t not in adjacency)
+
+        unreachable = [loc_id for loc_id in adjacency if loc_id not in reachable]
+        if unreachable:
+            problems.append(_describe(f"locations unreachable from location {start_id}",
+                                      unreachable, len(unreachable)))
+    if dangling:
+        problems.append(_describe("commands lead to locations that do not exist", list(dangling), len(dangling)))
+
+    # Items: fields, duplicate names, reachable start/target positions
+    item_names = set()
+    bad_items = []
+    duplicate_items = []
+    unreachable_items = []
+    for item in data['items']:
+        if not isinstance(item, dict) or not item.keys() >= _ITEM_KEY_SET:
+            bad_items.append(item.get('name') if isinstance(item, dict) else item)
+            continue
+        if item['name'] in item_names:
+            duplicate_items.append(item['name'])
+        item_names.add(item['name'])
+        for position in (item['start_position'], item['target_position']):
+            if position not in reachable:
+                unreachable_items.append(f"{item['name']} @ {position}")
+
+    if bad_items:
+        problems.append(_describe(f"items missing one of {ITEM_KEYS}", bad_items, len(bad_items)))
+    if duplicate_items:
+        problems.append(_describe("duplicate item names", duplicate_items, len(duplicate_items)))
+    if unreachable_items:
+        problems.append(_describe("item start/target positions that can't be reached",
+                                  unreachable_items, len(unreachable_items)))
+
+    unknown_items = [f"{name} @ {loc_id}" for loc_id, name in listed_items if name not in item_names]
+    if unknown_items:
+        problems.append(_describe("locations list items that are not in 'items'", unknown_items, len(unknown_items)))
+
+    return problems